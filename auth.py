@@ -1,12 +1,20 @@
 """Authentication utilities for autoposter-core."""
 
+import asyncio
+import base64
+import hashlib
+import hmac
 import os
-from datetime import datetime, timedelta
+import secrets
+import time
+from functools import lru_cache
+from typing import Optional
 
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+import jwt
+from jwt.exceptions import PyJWTError
 
 from db import get_user_by_id
 
@@ -15,6 +23,22 @@ JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-key-change-in-productio
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
+# Key material derived once at import: the encoded secret for PyJWT, and a
+# keyed HMAC whose copies sign OAuth states without redoing the key setup.
+_JWT_KEY = JWT_SECRET_KEY.encode("utf-8")
+_OAUTH_STATE_HMAC = hmac.new(_JWT_KEY, b"oauth-state:", hashlib.sha256)
+
+# bcrypt work factor (log2 rounds); lower it outside production to speed up tests
+BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+
+# Verified tokens are cached per time bucket, so each token is decoded and its
+# user loaded at most once per bucket; expiry is still checked on every request.
+TOKEN_CACHE_SECONDS = 30
+TOKEN_CACHE_SIZE = 4096
+
+# OAuth state lifetime in seconds
+OAUTH_STATE_TTL = 600
+
 # Security scheme for bearer token
 security = HTTPBearer()
 
@@ -22,7 +46,7 @@ security = HTTPBearer()
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
     password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_COST)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode("utf-8")
 
@@ -34,23 +58,33 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password in a worker thread so the event loop isn't blocked."""
+    return await asyncio.to_thread(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in a worker thread so the event loop isn't blocked."""
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(user_id: int, username: str) -> str:
     """Create a JWT access token."""
-    expires_at = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
+    expires_at = int(time.time()) + JWT_EXPIRATION_HOURS * 3600
     payload = {
         "sub": str(user_id),
         "username": username,
         "exp": expires_at
     }
-    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    return jwt.encode(payload, _JWT_KEY, algorithm=JWT_ALGORITHM)
 
 
 def decode_access_token(token: str) -> dict:
     """Decode and verify a JWT access token."""
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, _JWT_KEY, algorithms=[JWT_ALGORITHM])
         return payload
-    except JWTError:
+    except PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
@@ -58,14 +92,57 @@ def decode_access_token(token: str) -> dict:
         )
 
 
+def _sign_oauth_state(body: str) -> str:
+    """Compute the URL-safe HMAC-SHA256 signature for an OAuth state body."""
+    mac = _OAUTH_STATE_HMAC.copy()
+    mac.update(body.encode("utf-8"))
+    digest = mac.digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def create_oauth_state(user_id: int) -> str:
+    """Create a signed OAuth state binding the flow to a user.
+
+    The state carries the user ID, issue time and a random nonce, so it can be
+    validated without any server-side storage.
+    """
+    body = f"{user_id}.{int(time.time())}.{secrets.token_urlsafe(16)}"
+    return f"{body}.{_sign_oauth_state(body)}"
+
+
+def verify_oauth_state(state: str) -> Optional[int]:
+    """Return the user ID from a valid, unexpired OAuth state, or None."""
+    body, _, signature = state.rpartition(".")
+    expected = _sign_oauth_state(body)
+    if not hmac.compare_digest(signature.encode("utf-8"), expected.encode("ascii")):
+        return None
+
+    user_id, issued_at, _nonce = body.split(".")
+    if time.time() - int(issued_at) >= OAUTH_STATE_TTL:
+        return None
+    return int(user_id)
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _verify_and_load(token: str, epoch_bucket: int) -> tuple[dict, Optional[dict]]:
+    """Decode a token and load its user, memoized per (token, time bucket)."""
+    payload = decode_access_token(token)
+    return payload, get_user_by_id(int(payload.get("sub")))
+
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Dependency to get the current authenticated user from JWT token."""
     token = credentials.credentials
-    payload = decode_access_token(token)
-    
-    user_id = int(payload.get("sub"))
-    user = get_user_by_id(user_id)
-    
+    now = time.time()
+    payload, user = _verify_and_load(token, int(now) // TOKEN_CACHE_SECONDS)
+
+    if payload["exp"] <= now:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
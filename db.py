@@ -1,110 +1,239 @@
 """Database management for autoposter-core."""
 
-import sqlite3
+import asyncio
+import logging
+import os
 from typing import Optional
 
-conn = sqlite3.connect("posts.db", check_same_thread=False)
+# Prefer the newer, separately built SQLite bundled by pysqlite3-binary
+# (install the "sqlite" extra); fall back to the interpreter's sqlite3.
+try:
+    from pysqlite3 import dbapi2 as sqlite3
+except ImportError:
+    import sqlite3
 
-# Enable foreign keys
-conn.execute("PRAGMA foreign_keys = ON")
+DB_PATH = os.getenv("DB_PATH", "posts.db")
 
-# Create tables
-conn.execute("""
-CREATE TABLE IF NOT EXISTS users (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    username TEXT UNIQUE NOT NULL,
-    password_hash TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+logger = logging.getLogger(__name__)
+
+# Post logs are batched by the background writer: one transaction per
+# LOG_BATCH_SIZE rows or per LOG_FLUSH_INTERVAL seconds, whichever comes first.
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL = 0.1
+
+# Connection tuning: WAL lets readers proceed while a writer commits.
+# synchronous=NORMAL skips the fsync on each commit; under WAL the database
+# can't be corrupted, but the last commits before a power loss or OS crash
+# may be rolled back.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -20000",
 )
-""")
-
-conn.execute("""
-CREATE TABLE IF NOT EXISTS tiktok_tokens (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id INTEGER NOT NULL,
-    access_token TEXT NOT NULL,
-    refresh_token TEXT,
-    expires_at INTEGER,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+
+
+def connect(path: str = DB_PATH) -> sqlite3.Connection:
+    """Open a connection with WAL journaling and tuned PRAGMAs applied.
+
+    Rows come back as sqlite3.Row, so lookups can convert them with dict(row).
+    """
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        connection.execute(pragma)
+    return connection
+
+
+# Schema
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tiktok_tokens (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        access_token TEXT NOT NULL,
+        refresh_token TEXT,
+        expires_at INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        filename TEXT,
+        status TEXT,
+        platform TEXT,
+        response TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_posts_user ON posts(user_id, created_at DESC)",
+    # users.username is already covered by the implicit UNIQUE index.
 )
-""")
-
-conn.execute("""
-CREATE TABLE IF NOT EXISTS posts (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id INTEGER,
-    filename TEXT,
-    status TEXT,
-    platform TEXT,
-    response TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+
+# One token row per user: lets save_tiktok_tokens UPSERT on user_id and makes
+# token lookups a single index probe. Databases created before the index may
+# hold superseded rows, which are removed once, when the index is created.
+SQL_HAS_TOKENS_USER_INDEX = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_tiktok_user'"
+TOKENS_USER_INDEX_MIGRATION = (
+    "DELETE FROM tiktok_tokens WHERE id NOT IN (SELECT MAX(id) FROM tiktok_tokens GROUP BY user_id)",
+    "CREATE UNIQUE INDEX idx_tiktok_user ON tiktok_tokens(user_id)",
 )
-""")
 
-conn.commit()
 
+def init_db(connection: sqlite3.Connection) -> None:
+    """Create tables and indexes if they don't already exist."""
+    for statement in SCHEMA:
+        connection.execute(statement)
+    if connection.execute(SQL_HAS_TOKENS_USER_INDEX).fetchone() is None:
+        for statement in TOKENS_USER_INDEX_MIGRATION:
+            connection.execute(statement)
+    connection.commit()
 
-def log_post(filename: str, status: str, platform: str, response: str = "", user_id: Optional[int] = None):
-    """Log a post attempt to the database."""
-    conn.execute(
-        "INSERT INTO posts (user_id, filename, status, platform, response) VALUES (?, ?, ?, ?, ?)",
-        (user_id, filename, status, platform, response)
-    )
+
+conn = connect()
+init_db(conn)
+
+# Queries, kept in one place; sqlite3 caches each compiled statement by its text
+SQL_INSERT_POST = "INSERT INTO posts (user_id, filename, status, platform, response) VALUES (?, ?, ?, ?, ?)"
+SQL_INSERT_USER = "INSERT INTO users (username, password_hash) VALUES (?, ?) RETURNING id"
+SQL_GET_USER_BY_USERNAME = "SELECT id, username, password_hash, created_at FROM users WHERE username = ?"
+SQL_GET_USER_BY_ID = "SELECT id, username, password_hash, created_at FROM users WHERE id = ?"
+SQL_UPSERT_TIKTOK_TOKENS = (
+    "INSERT INTO tiktok_tokens (user_id, access_token, refresh_token, expires_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(user_id) DO UPDATE SET access_token = excluded.access_token, "
+    "refresh_token = excluded.refresh_token, expires_at = excluded.expires_at, "
+    "created_at = CURRENT_TIMESTAMP"
+)
+SQL_GET_TIKTOK_TOKENS = "SELECT access_token, refresh_token, expires_at FROM tiktok_tokens WHERE user_id = ?"
+SQL_HAS_TIKTOK_TOKENS = "SELECT 1 FROM tiktok_tokens WHERE user_id = ? LIMIT 1"
+
+
+# Queue feeding the background log writer and the loop it runs on; both are
+# None while it isn't running.
+_log_queue: Optional[asyncio.Queue] = None
+_log_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _on_log_writer_loop() -> bool:
+    """Check whether the caller runs on the log writer's event loop."""
+    try:
+        return asyncio.get_running_loop() is _log_loop
+    except RuntimeError:
+        return False
+
+
+def _insert_posts(rows: list[tuple]) -> None:
+    """Insert post log rows in a single transaction."""
+    conn.executemany(SQL_INSERT_POST, rows)
     conn.commit()
 
 
+def _write_log_batch(rows: list[tuple]) -> None:
+    """Insert a batch of post logs for the background writer, without raising.
+
+    If the batch fails (e.g. a row breaks a constraint), retry the rows one at
+    a time so only the bad ones are dropped, and log each of those.
+    """
+    try:
+        _insert_posts(rows)
+        return
+    except sqlite3.Error:
+        conn.rollback()
+
+    for row in rows:
+        try:
+            _insert_posts([row])
+        except sqlite3.Error:
+            conn.rollback()
+            logger.exception("Dropping post log row %r", row)
+
+
+def log_post(filename: str, status: str, platform: str, response: str = "", user_id: Optional[int] = None):
+    """Log a post attempt to the database.
+
+    When called on the event loop running the background log writer, the row
+    is queued and committed with the next batch; otherwise (no writer, or a
+    call from another thread) it is written immediately.
+    """
+    row = (user_id, filename, status, platform, response)
+    if _log_queue is not None and _on_log_writer_loop():
+        _log_queue.put_nowait(row)
+    else:
+        _insert_posts([row])
+
+
+async def run_log_writer() -> None:
+    """Write queued post logs in batches until cancelled, then flush the rest."""
+    global _log_queue, _log_loop
+    pending = _log_queue = asyncio.Queue()
+    _log_loop = asyncio.get_running_loop()
+    rows: list[tuple] = []
+    try:
+        while True:
+            rows.append(await pending.get())
+            try:
+                async with asyncio.timeout(LOG_FLUSH_INTERVAL):
+                    while len(rows) < LOG_BATCH_SIZE:
+                        rows.append(await pending.get())
+            except TimeoutError:
+                pass
+            batch, rows = rows, []
+            _write_log_batch(batch)
+    finally:
+        _log_queue = _log_loop = None
+        while not pending.empty():
+            rows.append(pending.get_nowait())
+        if rows:
+            _write_log_batch(rows)
+
+
 def create_user(username: str, password_hash: str) -> int:
     """Create a new user and return their ID."""
-    cursor = conn.execute(
-        "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+    user_id = conn.execute(
+        SQL_INSERT_USER,
         (username, password_hash)
-    )
+    ).fetchone()[0]
     conn.commit()
-    return cursor.lastrowid
+    return user_id
 
 
 def get_user_by_username(username: str) -> Optional[dict]:
     """Get a user by username."""
-    cursor = conn.execute(
-        "SELECT id, username, password_hash, created_at FROM users WHERE username = ?",
+    row = conn.execute(
+        SQL_GET_USER_BY_USERNAME,
         (username,)
-    )
-    row = cursor.fetchone()
-    if row:
-        return {
-            "id": row[0],
-            "username": row[1],
-            "password_hash": row[2],
-            "created_at": row[3]
-        }
-    return None
+    ).fetchone()
+    return dict(row) if row else None
 
 
 def get_user_by_id(user_id: int) -> Optional[dict]:
     """Get a user by ID."""
-    cursor = conn.execute(
-        "SELECT id, username, password_hash, created_at FROM users WHERE id = ?",
+    row = conn.execute(
+        SQL_GET_USER_BY_ID,
         (user_id,)
-    )
-    row = cursor.fetchone()
-    if row:
-        return {
-            "id": row[0],
-            "username": row[1],
-            "password_hash": row[2],
-            "created_at": row[3]
-        }
-    return None
+    ).fetchone()
+    return dict(row) if row else None
 
 
 def save_tiktok_tokens(user_id: int, access_token: str, refresh_token: Optional[str] = None, 
                        expires_at: Optional[int] = None):
     """Save or update TikTok tokens for a user."""
-    conn.execute("DELETE FROM tiktok_tokens WHERE user_id = ?", (user_id,))
     conn.execute(
-        "INSERT INTO tiktok_tokens (user_id, access_token, refresh_token, expires_at) VALUES (?, ?, ?, ?)",
+        SQL_UPSERT_TIKTOK_TOKENS,
         (user_id, access_token, refresh_token, expires_at)
     )
     conn.commit()
@@ -112,24 +241,17 @@ def save_tiktok_tokens(user_id: int, access_token: str, refresh_token: Optional[
 
 def get_tiktok_tokens(user_id: int) -> Optional[dict]:
     """Get TikTok tokens for a user."""
-    cursor = conn.execute(
-        "SELECT access_token, refresh_token, expires_at FROM tiktok_tokens WHERE user_id = ? ORDER BY created_at DESC LIMIT 1",
+    row = conn.execute(
+        SQL_GET_TIKTOK_TOKENS,
         (user_id,)
-    )
-    row = cursor.fetchone()
-    if row:
-        return {
-            "access_token": row[0],
-            "refresh_token": row[1],
-            "expires_at": row[2]
-        }
-    return None
+    ).fetchone()
+    return dict(row) if row else None
 
 
 def has_tiktok_linked(user_id: int) -> bool:
     """Check if a user has linked their TikTok account."""
-    cursor = conn.execute(
-        "SELECT COUNT(*) FROM tiktok_tokens WHERE user_id = ?",
+    row = conn.execute(
+        SQL_HAS_TIKTOK_TOKENS,
         (user_id,)
-    )
-    return cursor.fetchone()[0] > 0
+    ).fetchone()
+    return row is not None
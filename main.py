@@ -1,15 +1,27 @@
 """FastAPI application for autoposter-core."""
 
+import asyncio
+import contextlib
 import os
 import shutil
+import time
 from contextlib import asynccontextmanager
-from datetime import datetime
+from typing import Optional
 
+import requests
 from fastapi import FastAPI, UploadFile, HTTPException, Depends, Query
 from pydantic import BaseModel
 
-from auth import hash_password, verify_password, create_access_token, get_current_user
+from auth import (
+    hash_password_async,
+    verify_password_async,
+    create_access_token,
+    get_current_user,
+    create_oauth_state,
+    verify_oauth_state,
+)
 from db import (
+    run_log_writer,
     log_post,
     create_user,
     get_user_by_username,
@@ -21,22 +33,68 @@ from tiktok import (
     post_video,
     get_authorization_url,
     exchange_code_for_token,
+    refresh_access_token,
+    warm_connections,
+    WARM_CONNECTIONS,
     TikTokAPIError,
     MissingOAuthConfigError,
 )
 
 
 UPLOADS_DIR = "uploads"
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024  # 1MB, vs shutil's 64KB default
+
+# Refresh a stored TikTok access token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = 60
+
+
+def _save_upload(src, path: str) -> None:
+    """Write an uploaded file to disk in UPLOAD_COPY_BUFFER_SIZE blocks."""
+    with open(path, "wb") as dst:
+        shutil.copyfileobj(src, dst, UPLOAD_COPY_BUFFER_SIZE)
+
+
+def _save_token_data(user_id: int, token_data: dict, refresh_token: Optional[str] = None) -> None:
+    """Store tokens from TikTok's token endpoint, keeping refresh_token if none was returned."""
+    expires_at = None
+    if token_data.get("expires_in"):
+        expires_at = int(time.time()) + token_data["expires_in"]
+
+    save_tiktok_tokens(
+        user_id,
+        token_data["access_token"],
+        token_data.get("refresh_token") or refresh_token,
+        expires_at,
+    )
+
+
+async def _fresh_access_token(user_id: int, tokens: dict) -> str:
+    """Return the user's TikTok access token, refreshing it first if it is about to expire.
+
+    The stored token is reused until then, so uploads only pay for a token
+    round trip once per token lifetime.
+    """
+    expires_at = tokens.get("expires_at")
+    refresh_token = tokens.get("refresh_token")
+    if not expires_at or not refresh_token or expires_at - TOKEN_REFRESH_MARGIN > time.time():
+        return tokens["access_token"]
 
-# Store OAuth state temporarily (in production, use Redis or database)
-oauth_states: dict = {}
+    token_data = await asyncio.to_thread(refresh_access_token, refresh_token)
+    _save_token_data(user_id, token_data, refresh_token)
+    return token_data["access_token"]
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler - runs on startup and shutdown."""
     os.makedirs(UPLOADS_DIR, exist_ok=True)
+    if WARM_CONNECTIONS:
+        warm_connections()
+    log_writer = asyncio.create_task(run_log_writer())
     yield
+    log_writer.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await log_writer
 
 
 app = FastAPI(
@@ -82,7 +140,7 @@ async def register(request: RegisterRequest):
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already exists")
 
-    password_hash = hash_password(request.password)
+    password_hash = await hash_password_async(request.password)
     user_id = create_user(request.username, password_hash)
     token = create_access_token(user_id, request.username)
 
@@ -100,7 +158,7 @@ async def login(request: LoginRequest):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    if not verify_password(request.password, user["password_hash"]):
+    if not await verify_password_async(request.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
     token = create_access_token(user["id"], user["username"])
@@ -126,13 +184,7 @@ async def get_me(current_user: dict = Depends(get_current_user)):
 async def tiktok_login(current_user: dict = Depends(get_current_user)):
     """Get TikTok OAuth authorization URL."""
     try:
-        auth_url, state = get_authorization_url()
-
-        oauth_states[state] = {
-            "user_id": current_user["id"],
-            "created_at": datetime.utcnow(),
-        }
-
+        auth_url, _ = get_authorization_url(create_oauth_state(current_user["id"]))
         return {"authorization_url": auth_url}
 
     except MissingOAuthConfigError as e:
@@ -145,25 +197,13 @@ async def tiktok_callback(
     state: str = Query(..., description="State parameter for CSRF protection"),
 ):
     """Handle TikTok OAuth callback."""
-    if state not in oauth_states:
+    user_id = verify_oauth_state(state)
+    if user_id is None:
         raise HTTPException(status_code=400, detail="Invalid or expired state parameter")
 
-    state_data = oauth_states.pop(state)
-    user_id = state_data["user_id"]
-
     try:
         token_data = exchange_code_for_token(code)
-
-        expires_at = None
-        if token_data.get("expires_in"):
-            expires_at = int(datetime.utcnow().timestamp()) + token_data["expires_in"]
-
-        save_tiktok_tokens(
-            user_id,
-            token_data["access_token"],
-            token_data.get("refresh_token"),
-            expires_at,
-        )
+        _save_token_data(user_id, token_data)
 
         return {"success": True, "message": "TikTok account linked successfully"}
 
@@ -188,15 +228,30 @@ async def upload_video(
             detail="TikTok account not linked. Please link your TikTok account first.",
         )
 
+    try:
+        access_token = await _fresh_access_token(current_user["id"], tokens)
+    except TikTokAPIError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to refresh TikTok token: {e.message}")
+    except MissingOAuthConfigError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to refresh TikTok token: {e}")
+    except (requests.RequestException, ValueError) as e:
+        # Network failure, or a token response that isn't JSON
+        raise HTTPException(status_code=502, detail=f"Failed to refresh TikTok token: {e}")
+
     path = os.path.join(UPLOADS_DIR, file.filename)
 
-    with open(path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    # Both the disk copy and the TikTok upload block for the size of the video,
+    # so run them in worker threads to keep the event loop serving other requests.
+    await asyncio.to_thread(_save_upload, file.file, path)
 
+    # Check the publish status once instead of polling: TikTok may take minutes
+    # to process a video, and polling would hold this request and a worker
+    # thread (shared with password hashing) the whole time.
     try:
-        result = post_video(path, access_token=tokens["access_token"])
-        log_post(file.filename, "POSTED", "tiktok", str(result), current_user["id"])
-        return {"status": "posted", "platform": "tiktok", "result": result}
+        result = await asyncio.to_thread(post_video, path, access_token=access_token, wait=False)
+        status = "posted" if result["success"] else "processing"
+        log_post(file.filename, status.upper(), "tiktok", str(result), current_user["id"])
+        return {"status": status, "platform": "tiktok", "result": result}
 
     except TikTokAPIError as e:
         log_post(file.filename, "FAILED", "tiktok", str(e), current_user["id"])
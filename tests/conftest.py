@@ -2,10 +2,70 @@
 
 import os
 import tempfile
+from io import BytesIO
 import pytest
 from unittest.mock import patch
 from fastapi.testclient import TestClient
 
+# Sign tokens with a fixed test secret; auth derives its keys at import time.
+os.environ["JWT_SECRET_KEY"] = "test-secret-key-for-autoposter-suite"
+# Each test process (every xdist worker included) gets its own database file
+# instead of ./posts.db; db opens it on first import.
+_db_dir = tempfile.TemporaryDirectory(prefix="autoposter-tests-")
+os.environ["DB_PATH"] = os.path.join(_db_dir.name, "posts.db")
+# Keep app startup off the network.
+os.environ["TIKTOK_WARM_CONNECTIONS"] = "0"
+
+
+@pytest.fixture(autouse=True, scope="session")
+def fast_bcrypt():
+    """Hash passwords at bcrypt's minimum cost, whatever BCRYPT_COST is set to."""
+    import auth
+    with patch.object(auth, "BCRYPT_COST", 4):
+        yield
+
+
+@pytest.fixture(scope="session")
+def hashed_password123(fast_bcrypt):
+    """bcrypt hash of "password123", computed once per session."""
+    from auth import hash_password
+    return hash_password("password123")
+
+
+@pytest.fixture(scope="session")
+def user_token():
+    """Access token for user 1 ("testuser"), signed once per session."""
+    from auth import create_access_token
+    return create_access_token(1, "testuser")
+
+
+# 2024-01-01T00:00:00Z, the instant the frozen_time fixture pins the clock to.
+FROZEN_TIME = 1704067200.0
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Pin the clock auth reads, so OAuth state timestamps are deterministic."""
+    clock = {"now": FROZEN_TIME}
+    monkeypatch.setattr("auth.time.time", lambda: clock["now"])
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Drop cached token verifications so patched users don't leak between tests."""
+    from auth import _verify_and_load
+    _verify_and_load.cache_clear()
+    yield
+    _verify_and_load.cache_clear()
+
+
+@pytest.fixture
+def current_user(monkeypatch):
+    """Resolve any authenticated user ID to a "testuser" record without the database."""
+    import auth
+    monkeypatch.setattr(auth, "get_user_by_id", lambda user_id: {"id": user_id, "username": "testuser"})
+
 
 @pytest.fixture
 def mock_video_file():
@@ -18,12 +78,20 @@ def mock_video_file():
         os.unlink(f.name)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_video_bytes():
     """Return mock video bytes for upload testing."""
     return b"fake video content " * 1000
 
 
+@pytest.fixture(scope="session")
+def video_file(mock_video_bytes):
+    """Build a multipart file tuple of the mock video for the given filename."""
+    def make(name="test.mp4"):
+        return (name, BytesIO(mock_video_bytes), "video/mp4")
+    return make
+
+
 @pytest.fixture
 def mock_tiktok_init_response():
     """Mock successful TikTok init response."""
@@ -85,58 +153,40 @@ def env_without_token():
         yield
 
 
-@pytest.fixture
-def test_client():
-    """Create a FastAPI test client."""
-    from main import app
-    return TestClient(app)
+@pytest.fixture(scope="session")
+def client(tmp_path_factory):
+    """FastAPI test client shared by the session; the app lifespan runs once."""
+    import main
+    # Left for the lifespan to create, so startup is exercised as in production.
+    uploads_dir = tmp_path_factory.mktemp("app") / "uploads"
+    with patch.object(main, "UPLOADS_DIR", str(uploads_dir)), TestClient(main.app) as test_client:
+        yield test_client
 
 
-@pytest.fixture
-def in_memory_db():
-    """Create an in-memory SQLite database for testing."""
-    import sqlite3
-    conn = sqlite3.connect(":memory:", check_same_thread=False)
-    conn.execute("PRAGMA foreign_keys = ON")
-    
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS tiktok_tokens (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            access_token TEXT NOT NULL,
-            refresh_token TEXT,
-            expires_at INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-        )
-    """)
-    
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS posts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            filename TEXT,
-            status TEXT,
-            platform TEXT,
-            response TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
-        )
-    """)
-    conn.commit()
+@pytest.fixture(scope="session")
+def session_db():
+    """In-memory SQLite database whose schema is created once per session."""
+    import db
+    conn = db.connect(":memory:")
+    db.init_db(conn)
     yield conn
     conn.close()
 
 
+@pytest.fixture
+def in_memory_db(session_db):
+    """Provide the session database, emptied again after each test."""
+    import db
+    yield session_db
+
+    # db functions commit as they go, so reset by deleting rows instead of
+    # rolling back; init_db restores anything a test dropped.
+    session_db.rollback()
+    for table in ("posts", "tiktok_tokens", "users", "sqlite_sequence"):
+        session_db.execute(f"DELETE FROM {table}")
+    db.init_db(session_db)
+
+
 @pytest.fixture
 def temp_uploads_dir():
     """Create a temporary uploads directory."""
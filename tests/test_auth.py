@@ -1,11 +1,31 @@
 """Unit tests for authentication and OAuth flow."""
 
-import pytest
-from unittest.mock import patch
-from datetime import datetime, timedelta
-from io import BytesIO
+import os
+import tempfile
+import time
 
-from fastapi.testclient import TestClient
+import jwt
+import pytest
+import requests
+from fastapi import HTTPException
+
+import auth
+import db
+import main
+from auth import (
+    JWT_ALGORITHM,
+    JWT_SECRET_KEY,
+    OAUTH_STATE_TTL,
+    create_access_token,
+    create_oauth_state,
+    decode_access_token,
+    hash_password,
+    hash_password_async,
+    verify_oauth_state,
+    verify_password,
+    verify_password_async,
+)
+from main import _save_upload
 
 
 class TestPasswordHashing:
@@ -13,16 +33,21 @@ class TestPasswordHashing:
 
     def test_hash_password_returns_hash(self):
         """Should return a bcrypt hash."""
-        from auth import hash_password
         password = "test_password_123"
         hashed = hash_password(password)
 
         assert hashed != password
         assert hashed.startswith("$2b$")
 
+    def test_hash_password_uses_configured_cost(self):
+        """Should hash with the BCRYPT_COST work factor (pinned to 4 in tests)."""
+        hashed = hash_password("test_password_123")
+
+        assert auth.BCRYPT_COST == 4
+        assert hashed.startswith(f"$2b${auth.BCRYPT_COST:02d}$")
+
     def test_verify_password_correct(self):
         """Should verify correct password."""
-        from auth import hash_password, verify_password
         password = "test_password_123"
         hashed = hash_password(password)
 
@@ -30,19 +55,24 @@ class TestPasswordHashing:
 
     def test_verify_password_incorrect(self):
         """Should reject incorrect password."""
-        from auth import hash_password, verify_password
         password = "test_password_123"
         hashed = hash_password(password)
 
         assert verify_password("wrong_password", hashed) is False
 
+    async def test_password_helpers_async(self):
+        """Should hash and verify passwords off the event loop."""
+        hashed = await hash_password_async("test_password_123")
+
+        assert await verify_password_async("test_password_123", hashed) is True
+        assert await verify_password_async("wrong_password", hashed) is False
+
 
 class TestJWT:
     """Tests for JWT token creation and validation."""
 
     def test_create_access_token(self):
         """Should create a valid JWT token."""
-        from auth import create_access_token
         token = create_access_token(1, "testuser")
 
         assert isinstance(token, str)
@@ -50,18 +80,21 @@ class TestJWT:
 
     def test_decode_access_token_valid(self):
         """Should decode valid token."""
-        from auth import create_access_token, decode_access_token
         token = create_access_token(42, "testuser")
         payload = decode_access_token(token)
 
         assert int(payload["sub"]) == 42
         assert payload["username"] == "testuser"
 
+    def test_token_signed_with_configured_secret(self):
+        """Should sign with JWT_SECRET_KEY via the precomputed key."""
+        token = create_access_token(42, "testuser")
+
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        assert payload["sub"] == "42"
+
     def test_decode_access_token_invalid(self):
         """Should raise HTTPException for invalid token."""
-        from auth import decode_access_token
-        from fastapi import HTTPException
-
         with pytest.raises(HTTPException) as exc_info:
             decode_access_token("invalid_token")
         assert exc_info.value.status_code == 401
@@ -70,98 +103,134 @@ class TestJWT:
 class TestAuthEndpoints:
     """Tests for authentication API endpoints."""
 
-    def test_register_success(self):
+    def test_register_success(self, client, monkeypatch):
         """Should register a new user."""
-        from main import app
-        client = TestClient(app)
-
-        with patch("main.get_user_by_username", return_value=None), \
-             patch("main.create_user", return_value=1):
-            response = client.post(
-                "/auth/register",
-                json={"username": "newuser", "password": "password123"},
-            )
+        monkeypatch.setattr(main, "get_user_by_username", lambda username: None)
+        monkeypatch.setattr(main, "create_user", lambda username, password_hash: 1)
+
+        response = client.post(
+            "/auth/register",
+            json={"username": "newuser", "password": "password123"},
+        )
 
         assert response.status_code == 200
         data = response.json()
         assert "access_token" in data
         assert data["username"] == "newuser"
 
-    def test_register_duplicate_username(self):
+    def test_register_duplicate_username(self, client, monkeypatch):
         """Should reject duplicate username."""
-        from main import app
-        client = TestClient(app)
+        monkeypatch.setattr(main, "get_user_by_username", lambda username: {"id": 1, "username": "existing"})
 
-        with patch("main.get_user_by_username", return_value={"id": 1, "username": "existing"}):
-            response = client.post(
-                "/auth/register",
-                json={"username": "existing", "password": "password123"},
-            )
+        response = client.post(
+            "/auth/register",
+            json={"username": "existing", "password": "password123"},
+        )
 
         assert response.status_code == 400
         assert "already exists" in response.json()["detail"]
 
-    def test_login_success(self):
+    def test_login_success(self, client, monkeypatch, hashed_password123):
         """Should login with correct credentials."""
-        from main import app
-        from auth import hash_password
-        client = TestClient(app)
-
         mock_user = {
             "id": 1,
             "username": "testuser",
-            "password_hash": hash_password("password123"),
+            "password_hash": hashed_password123,
         }
+        monkeypatch.setattr(main, "get_user_by_username", lambda username: mock_user)
 
-        with patch("main.get_user_by_username", return_value=mock_user):
-            response = client.post(
-                "/auth/login",
-                json={"username": "testuser", "password": "password123"},
-            )
+        response = client.post(
+            "/auth/login",
+            json={"username": "testuser", "password": "password123"},
+        )
 
         assert response.status_code == 200
         data = response.json()
         assert "access_token" in data
 
-    def test_login_invalid_username(self):
+    def test_login_wrong_password(self, client, monkeypatch, hashed_password123):
+        """Should reject an incorrect password."""
+        mock_user = {"id": 1, "username": "testuser", "password_hash": hashed_password123}
+        monkeypatch.setattr(main, "get_user_by_username", lambda username: mock_user)
+
+        response = client.post(
+            "/auth/login",
+            json={"username": "testuser", "password": "wrong_password"},
+        )
+
+        assert response.status_code == 401
+
+    def test_login_invalid_username(self, client, monkeypatch):
         """Should reject invalid username."""
-        from main import app
-        client = TestClient(app)
+        monkeypatch.setattr(main, "get_user_by_username", lambda username: None)
 
-        with patch("main.get_user_by_username", return_value=None):
-            response = client.post(
-                "/auth/login",
-                json={"username": "nonexistent", "password": "password123"},
-            )
+        response = client.post(
+            "/auth/login",
+            json={"username": "nonexistent", "password": "password123"},
+        )
 
         assert response.status_code == 401
 
-    def test_get_me_authenticated(self):
+    def test_get_me_authenticated(self, client, monkeypatch, current_user, user_token):
         """Should return user info when authenticated."""
-        from main import app
-        from auth import create_access_token
-        client = TestClient(app)
+        monkeypatch.setattr(main, "has_tiktok_linked", lambda user_id: True)
 
-        token = create_access_token(1, "testuser")
-
-        with patch("auth.get_user_by_id", return_value={"id": 1, "username": "testuser"}), \
-             patch("main.has_tiktok_linked", return_value=True):
-            response = client.get(
-                "/auth/me",
-                headers={"Authorization": f"Bearer {token}"},
-            )
+        response = client.get(
+            "/auth/me",
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
 
         assert response.status_code == 200
         data = response.json()
         assert data["username"] == "testuser"
         assert data["tiktok_linked"] is True
 
-    def test_get_me_unauthenticated(self):
-        """Should reject unauthenticated request."""
-        from main import app
-        client = TestClient(app)
+    def test_get_me_caches_token_verification(self, client, monkeypatch, user_token):
+        """Should decode the token and load the user once for repeated requests."""
+        lookups = []
+
+        def get_user_by_id(user_id):
+            lookups.append(user_id)
+            return {"id": user_id, "username": "testuser"}
 
-        response = client.get("/auth/me")
+        monkeypatch.setattr(auth, "get_user_by_id", get_user_by_id)
+        monkeypatch.setattr(main, "has_tiktok_linked", lambda user_id: False)
+
+        for _ in range(3):
+            response = client.get(
+                "/auth/me",
+                headers={"Authorization": f"Bearer {user_token}"},
+            )
+            assert response.status_code == 200
+
+        assert lookups == [1]
+
+    def test_get_me_rejects_expired_token(self, client, monkeypatch, current_user, user_token):
+        """Should re-check exp rather than trusting a cached verification."""
+        headers = {"Authorization": f"Bearer {user_token}"}
+        monkeypatch.setattr(main, "has_tiktok_linked", lambda user_id: False)
+
+        assert client.get("/auth/me", headers=headers).status_code == 200
+
+        later = time.time() + 25 * 3600
+        monkeypatch.setattr("auth.time.time", lambda: later)
+        response = client.get("/auth/me", headers=headers)
+
+        assert response.status_code == 401
+
+
+class TestAuthenticationRequired:
+    """Tests that protected endpoints reject requests without a token."""
+
+    @pytest.mark.parametrize("method, path, upload", [
+        ("GET", "/auth/me", False),
+        ("GET", "/auth/tiktok/login", False),
+        ("POST", "/upload", True),
+    ])
+    def test_rejects_unauthenticated(self, client, video_file, method, path, upload):
+        """Should reject the request before running the endpoint."""
+        files = {"file": video_file()} if upload else None
+        response = client.request(method, path, files=files)
         # 401 Unauthorized or 403 Forbidden are both valid
         assert response.status_code in (401, 403)
 
@@ -169,121 +238,316 @@ class TestAuthEndpoints:
 class TestTikTokOAuthEndpoints:
     """Tests for TikTok OAuth endpoints."""
 
-    def test_tiktok_login_success(self):
+    def test_tiktok_login_success(self, client, monkeypatch, current_user, user_token):
         """Should return TikTok authorization URL."""
-        from main import app
-        from auth import create_access_token
-        client = TestClient(app)
+        monkeypatch.setattr(main, "get_authorization_url", lambda state: ("https://tiktok.com/auth?state=abc", "abc"))
 
-        token = create_access_token(1, "testuser")
-
-        with patch("auth.get_user_by_id", return_value={"id": 1, "username": "testuser"}), \
-             patch("main.get_authorization_url", return_value=("https://tiktok.com/auth?state=abc", "abc")):
-            response = client.get(
-                "/auth/tiktok/login",
-                headers={"Authorization": f"Bearer {token}"},
-            )
+        response = client.get(
+            "/auth/tiktok/login",
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
 
         assert response.status_code == 200
         assert "authorization_url" in response.json()
 
-    def test_tiktok_callback_success(self):
-        """Should handle OAuth callback successfully."""
-        from main import app, oauth_states
-        from datetime import datetime
-        client = TestClient(app)
+    def test_tiktok_login_signs_state_for_user(self, client, monkeypatch, current_user):
+        """Should pass a state bound to the current user to TikTok."""
+        states = []
+
+        def get_authorization_url(state):
+            states.append(state)
+            return "https://tiktok.com/auth", state
+
+        monkeypatch.setattr(main, "get_authorization_url", get_authorization_url)
+        token = create_access_token(7, "testuser")
+
+        client.get(
+            "/auth/tiktok/login",
+            headers={"Authorization": f"Bearer {token}"},
+        )
 
-        state = "test_state_123"
-        oauth_states[state] = {"user_id": 1, "created_at": datetime.utcnow()}
+        assert [verify_oauth_state(state) for state in states] == [7]
+
+    def test_tiktok_callback_success(self, client, monkeypatch, frozen_time):
+        """Should handle OAuth callback successfully."""
+        state = create_oauth_state(1)
 
         mock_token_data = {
             "access_token": "test_access_token",
             "refresh_token": "test_refresh_token",
             "expires_in": 3600,
         }
+        saved = []
+        monkeypatch.setattr(main, "exchange_code_for_token", lambda code: mock_token_data)
+        monkeypatch.setattr(main, "save_tiktok_tokens", lambda user_id, *args, **kwargs: saved.append(user_id))
 
-        with patch("main.exchange_code_for_token", return_value=mock_token_data), \
-             patch("main.save_tiktok_tokens"):
-            response = client.get(f"/auth/tiktok/callback?code=test_code&state={state}")
+        response = client.get(f"/auth/tiktok/callback?code=test_code&state={state}")
 
         assert response.status_code == 200
         assert response.json()["success"] is True
+        assert saved == [1]
 
-    def test_tiktok_callback_invalid_state(self):
+    def test_tiktok_callback_invalid_state(self, client):
         """Should reject invalid state."""
-        from main import app
-        client = TestClient(app)
-
         response = client.get("/auth/tiktok/callback?code=test&state=invalid")
         assert response.status_code == 400
 
+    def test_tiktok_callback_expired_state(self, client, frozen_time):
+        """Should reject a state older than the TTL."""
+        state = create_oauth_state(1)
+        frozen_time["now"] += OAUTH_STATE_TTL
+
+        response = client.get(f"/auth/tiktok/callback?code=test_code&state={state}")
+        assert response.status_code == 400
+
+
+class TestOAuthState:
+    """Tests for signed OAuth state values."""
+
+    def test_round_trip(self):
+        """Should recover the user ID from a fresh state."""
+        assert verify_oauth_state(create_oauth_state(42)) == 42
+
+    def test_accepted_until_ttl(self, frozen_time):
+        """Should accept a state up to the last second before the TTL."""
+        state = create_oauth_state(42)
+        frozen_time["now"] += OAUTH_STATE_TTL - 1
+        assert verify_oauth_state(state) == 42
+
+        frozen_time["now"] += 1
+        assert verify_oauth_state(state) is None
+
+    def test_states_are_unique(self):
+        """Should include a random nonce in every state."""
+        assert create_oauth_state(1) != create_oauth_state(1)
+
+    def test_tampered_user_id_rejected(self):
+        """Should reject a state whose user ID was changed."""
+        state = create_oauth_state(1)
+        assert verify_oauth_state("2" + state[1:]) is None
+
+    def test_tampered_signature_rejected(self):
+        """Should reject a state with a forged signature."""
+        body, _, _ = create_oauth_state(1).rpartition(".")
+        assert verify_oauth_state(f"{body}.forged") is None
+
+    def test_non_ascii_state_rejected(self):
+        """Should reject non-ASCII input instead of raising."""
+        assert verify_oauth_state("1.2.nonce.\u00e9") is None
+
 
 class TestUploadEndpointWithAuth:
     """Tests for authenticated upload endpoint."""
 
-    def test_upload_unauthenticated(self, mock_video_bytes):
-        """Should reject unauthenticated upload."""
-        from main import app
-        client = TestClient(app)
+    @pytest.fixture(autouse=True)
+    def skip_upload_write(self, request, monkeypatch):
+        """Stub the disk copy unless the test is marked writes_upload."""
+        if request.node.get_closest_marker("writes_upload") is None:
+            monkeypatch.setattr(main, "_save_upload", lambda src, path: None)
+
+    def test_upload_without_tiktok_linked(self, client, monkeypatch, current_user, user_token, video_file):
+        """Should reject upload when TikTok not linked."""
+        monkeypatch.setattr(main, "get_tiktok_tokens", lambda user_id: None)
 
         response = client.post(
             "/upload",
-            files={"file": ("test.mp4", BytesIO(mock_video_bytes), "video/mp4")},
+            files={"file": video_file()},
+            headers={"Authorization": f"Bearer {user_token}"},
         )
-        # 401 Unauthorized or 403 Forbidden are both valid
-        assert response.status_code in (401, 403)
-
-    def test_upload_without_tiktok_linked(self, mock_video_bytes):
-        """Should reject upload when TikTok not linked."""
-        from main import app
-        from auth import create_access_token
-        client = TestClient(app)
-
-        token = create_access_token(1, "testuser")
-
-        with patch("auth.get_user_by_id", return_value={"id": 1, "username": "testuser"}), \
-             patch("main.get_tiktok_tokens", return_value=None):
-            response = client.post(
-                "/upload",
-                files={"file": ("test.mp4", BytesIO(mock_video_bytes), "video/mp4")},
-                headers={"Authorization": f"Bearer {token}"},
-            )
 
         assert response.status_code == 400
         assert "not linked" in response.json()["detail"]
 
-    def test_upload_success(self, mock_video_bytes):
+    def test_upload_success(self, client, monkeypatch, current_user, user_token, video_file):
         """Should upload video when authenticated and TikTok linked."""
-        from main import app
-        from auth import create_access_token
-        client = TestClient(app)
-
-        token = create_access_token(1, "testuser")
         mock_tokens = {"access_token": "tiktok_token", "refresh_token": None, "expires_at": None}
         mock_result = {"success": True, "publish_id": "123", "status": "COMPLETE"}
+        monkeypatch.setattr(main, "get_tiktok_tokens", lambda user_id: mock_tokens)
+        monkeypatch.setattr(main, "post_video", lambda path, access_token=None, wait=True: mock_result)
+        monkeypatch.setattr(main, "log_post", lambda *args, **kwargs: None)
 
-        with patch("auth.get_user_by_id", return_value={"id": 1, "username": "testuser"}), \
-             patch("main.get_tiktok_tokens", return_value=mock_tokens), \
-             patch("main.post_video", return_value=mock_result), \
-             patch("main.log_post"):
-            response = client.post(
-                "/upload",
-                files={"file": ("test.mp4", BytesIO(mock_video_bytes), "video/mp4")},
-                headers={"Authorization": f"Bearer {token}"},
-            )
+        response = client.post(
+            "/upload",
+            files={"file": video_file()},
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
 
         assert response.status_code == 200
         assert response.json()["status"] == "posted"
 
+    def test_upload_does_not_wait_for_processing(self, client, monkeypatch, current_user, user_token, video_file):
+        """Should check the publish status once and report a video still being processed."""
+        mock_tokens = {"access_token": "tiktok_token", "refresh_token": None, "expires_at": None}
+        calls, logged = [], []
+        monkeypatch.setattr(main, "get_tiktok_tokens", lambda user_id: mock_tokens)
+        monkeypatch.setattr(main, "post_video", lambda path, access_token=None, wait=True: calls.append(wait) or {
+            "success": False, "publish_id": "123", "status": "PROCESSING_UPLOAD",
+        })
+        monkeypatch.setattr(main, "log_post", lambda *args, **kwargs: logged.append(args[1]))
+
+        response = client.post(
+            "/upload",
+            files={"file": video_file()},
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "processing"
+        assert calls == [False]
+        assert logged == ["PROCESSING"]
+
+    def test_upload_refreshes_expiring_token(self, client, monkeypatch, current_user, user_token, video_file):
+        """Should refresh and store a token that is about to expire before posting."""
+        mock_tokens = {"access_token": "old_token", "refresh_token": "refresh", "expires_at": int(time.time()) + 10}
+        saved = []
+        used = []
+        monkeypatch.setattr(main, "get_tiktok_tokens", lambda user_id: mock_tokens)
+        monkeypatch.setattr(main, "refresh_access_token", lambda refresh_token: {
+            "access_token": "new_token", "refresh_token": None, "expires_in": 86400,
+        })
+        monkeypatch.setattr(main, "save_tiktok_tokens", lambda *args: saved.append(args))
+        monkeypatch.setattr(main, "post_video", lambda path, access_token=None, wait=True: used.append(access_token) or {"success": True})
+        monkeypatch.setattr(main, "log_post", lambda *args, **kwargs: None)
+
+        response = client.post(
+            "/upload",
+            files={"file": video_file()},
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
+
+        assert response.status_code == 200
+        assert used == ["new_token"]
+        assert [args[:3] for args in saved] == [(1, "new_token", "refresh")]
+
+    def test_upload_reuses_valid_token(self, client, monkeypatch, current_user, user_token, video_file):
+        """Should not contact TikTok's token endpoint while the stored token is valid."""
+        mock_tokens = {"access_token": "tiktok_token", "refresh_token": "refresh", "expires_at": int(time.time()) + 3600}
+        used = []
+        monkeypatch.setattr(main, "get_tiktok_tokens", lambda user_id: mock_tokens)
+        monkeypatch.setattr(main, "refresh_access_token", lambda refresh_token: pytest.fail("refreshed a valid token"))
+        monkeypatch.setattr(main, "post_video", lambda path, access_token=None, wait=True: used.append(access_token) or {"success": True})
+        monkeypatch.setattr(main, "log_post", lambda *args, **kwargs: None)
+
+        response = client.post(
+            "/upload",
+            files={"file": video_file()},
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
+
+        assert response.status_code == 200
+        assert used == ["tiktok_token"]
+
+    def test_upload_refresh_failure(self, client, monkeypatch, current_user, user_token, video_file):
+        """Should report a failed token refresh as a bad gateway."""
+        def refresh_access_token(refresh_token):
+            raise main.TikTokAPIError("invalid_grant", "Refresh token expired")
+
+        mock_tokens = {"access_token": "old_token", "refresh_token": "refresh", "expires_at": int(time.time()) - 10}
+        monkeypatch.setattr(main, "get_tiktok_tokens", lambda user_id: mock_tokens)
+        monkeypatch.setattr(main, "refresh_access_token", refresh_access_token)
+
+        response = client.post(
+            "/upload",
+            files={"file": video_file()},
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
+
+        assert response.status_code == 502
+        assert "refresh" in response.json()["detail"]
+
+    @pytest.mark.parametrize("error, status_code", [
+        (main.MissingOAuthConfigError(), 500),
+        (requests.ConnectionError("connection refused"), 502),
+        (ValueError("Expecting value: line 1 column 1 (char 0)"), 502),
+    ])
+    def test_upload_refresh_error_reported(
+        self, client, monkeypatch, current_user, user_token, video_file, error, status_code,
+    ):
+        """Should turn config, network and malformed-response refresh errors into explicit responses."""
+        def refresh_access_token(refresh_token):
+            raise error
+
+        mock_tokens = {"access_token": "old_token", "refresh_token": "refresh", "expires_at": int(time.time()) - 10}
+        monkeypatch.setattr(main, "get_tiktok_tokens", lambda user_id: mock_tokens)
+        monkeypatch.setattr(main, "refresh_access_token", refresh_access_token)
+
+        response = client.post(
+            "/upload",
+            files={"file": video_file()},
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
+
+        assert response.status_code == status_code
+        assert response.json()["detail"].startswith("Failed to refresh TikTok token")
+
+    @pytest.mark.writes_upload
+    def test_file_saved_to_uploads(self, client, monkeypatch, current_user, user_token, video_file, mock_video_bytes):
+        """Should write the uploaded video into the uploads directory."""
+        mock_tokens = {"access_token": "tiktok_token", "refresh_token": None, "expires_at": None}
+        saved = []
+        monkeypatch.setattr(main, "get_tiktok_tokens", lambda user_id: mock_tokens)
+        monkeypatch.setattr(main, "log_post", lambda *args, **kwargs: None)
+
+        def post_video(path, access_token=None, wait=True):
+            with open(path, "rb") as f:
+                saved.append(f.read())
+            return {"success": True, "publish_id": "123", "status": "COMPLETE"}
+
+        monkeypatch.setattr(main, "post_video", post_video)
+
+        response = client.post(
+            "/upload",
+            files={"file": video_file("saved.mp4")},
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
+
+        assert response.status_code == 200
+        assert saved == [mock_video_bytes]
+
+
+class TestSaveUpload:
+    """Tests for writing uploaded files to disk."""
+
+    def test_save_in_memory_upload(self, tmp_path, mock_video_bytes):
+        """Should copy an upload that is still held in memory."""
+        src = tempfile.SpooledTemporaryFile(max_size=len(mock_video_bytes) * 2)
+        src.write(mock_video_bytes)
+        src.seek(0)
+
+        dest = tmp_path / "video.mp4"
+        _save_upload(src, str(dest))
+
+        assert dest.read_bytes() == mock_video_bytes
+
+    def test_save_rolled_over_upload(self, tmp_path, mock_video_bytes):
+        """Should copy an upload that has spilled to disk."""
+        src = tempfile.SpooledTemporaryFile(max_size=16)
+        src.write(mock_video_bytes)
+        src.seek(0)
+
+        dest = tmp_path / "video.mp4"
+        _save_upload(src, str(dest))
+
+        assert dest.read_bytes() == mock_video_bytes
+
+
+class TestLifespan:
+    """Tests for work done once when the app starts."""
+
+    def test_uploads_dir_created_on_startup(self, client):
+        """Should create the uploads directory before serving requests."""
+        assert os.path.isdir(main.UPLOADS_DIR)
+
+    def test_log_writer_running(self, client):
+        """Should start the background post log writer."""
+        assert db._log_queue is not None
+
 
 class TestHealthCheck:
     """Tests for health check endpoint."""
 
-    def test_health_check(self):
+    def test_health_check(self, client):
         """Should return healthy status."""
-        from main import app
-        client = TestClient(app)
-
         response = client.get("/health")
         assert response.status_code == 200
         assert response.json()["status"] == "healthy"
@@ -1,5 +1,7 @@
 """Unit tests for database logging."""
 
+import asyncio
+
 import pytest
 from unittest.mock import patch
 
@@ -53,6 +55,148 @@ class TestLogPost:
             count = cursor.fetchone()[0]
             assert count == 3
 
+    def test_log_post_special_characters_in_filename(self, in_memory_db):
+        """Should store filenames with quotes, spaces and unicode unchanged."""
+        filename = "my 'video' \"final\" \u00e9t\u00e9 \U0001f3ac.mp4"
+        with patch.object(db, "conn", in_memory_db):
+            log_post(filename, "POSTED", "tiktok", "")
+
+            cursor = in_memory_db.execute("SELECT filename FROM posts")
+            assert cursor.fetchone()[0] == filename
+
+    def test_log_post_long_response(self, in_memory_db):
+        """Should store a long response without truncation."""
+        response = "x" * 100_000
+        with patch.object(db, "conn", in_memory_db):
+            log_post("test_video.mp4", "FAILED", "tiktok", response)
+
+            cursor = in_memory_db.execute("SELECT response FROM posts")
+            assert cursor.fetchone()[0] == response
+
+
+class TestLogWriter:
+    """Tests for the batched background log writer."""
+
+    @pytest.fixture(autouse=True)
+    def keep_app_log_writer(self, monkeypatch):
+        """Restore the session app's writer hooks, which run_log_writer clears on exit."""
+        monkeypatch.setattr(db, "_log_queue", db._log_queue)
+        monkeypatch.setattr(db, "_log_loop", db._log_loop)
+
+    async def test_queued_logs_written_in_one_batch(self, in_memory_db):
+        """Should commit queued rows together in a single executemany."""
+        with patch.object(db, "conn", in_memory_db), \
+             patch.object(db, "LOG_FLUSH_INTERVAL", 0.01), \
+             patch.object(db, "_insert_posts", wraps=db._insert_posts) as mock_insert:
+            writer = asyncio.create_task(db.run_log_writer())
+            await asyncio.sleep(0)
+
+            log_post("video1.mp4", "POSTED", "tiktok", "result1")
+            log_post("video2.mp4", "FAILED", "tiktok", "error")
+            log_post("video3.mp4", "POSTED", "tiktok", "result3")
+            await asyncio.sleep(0.05)
+
+            writer.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await writer
+
+        mock_insert.assert_called_once()
+        assert len(mock_insert.call_args.args[0]) == 3
+        count = in_memory_db.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        assert count == 3
+
+    async def test_batch_size_caps_transaction(self, in_memory_db):
+        """Should flush as soon as a full batch is queued."""
+        with patch.object(db, "conn", in_memory_db), \
+             patch.object(db, "LOG_BATCH_SIZE", 2), \
+             patch.object(db, "LOG_FLUSH_INTERVAL", 10), \
+             patch.object(db, "_insert_posts", wraps=db._insert_posts) as mock_insert:
+            writer = asyncio.create_task(db.run_log_writer())
+            await asyncio.sleep(0)
+
+            log_post("video1.mp4", "POSTED", "tiktok")
+            log_post("video2.mp4", "POSTED", "tiktok")
+            await asyncio.sleep(0.01)
+
+            assert mock_insert.call_count == 1
+            writer.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await writer
+
+    async def test_log_post_off_loop_writes_directly(self, in_memory_db):
+        """Should bypass the queue when called from a thread other than the writer's loop."""
+        with patch.object(db, "conn", in_memory_db), \
+             patch.object(db, "LOG_FLUSH_INTERVAL", 10):
+            writer = asyncio.create_task(db.run_log_writer())
+            await asyncio.sleep(0)
+
+            await asyncio.to_thread(log_post, "video1.mp4", "POSTED", "tiktok")
+
+            count = in_memory_db.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            assert count == 1
+            assert db._log_queue.empty()
+            writer.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await writer
+
+    async def test_bad_row_skipped_and_writer_keeps_running(self, in_memory_db, caplog):
+        """Should keep the valid rows of a failing batch, drop the bad one and stay up."""
+        with patch.object(db, "conn", in_memory_db), \
+             patch.object(db, "LOG_FLUSH_INTERVAL", 0.01):
+            writer = asyncio.create_task(db.run_log_writer())
+            await asyncio.sleep(0)
+
+            log_post("video1.mp4", "POSTED", "tiktok")
+            log_post("orphan.mp4", "POSTED", "tiktok", user_id=999)
+            await asyncio.sleep(0.05)
+
+            assert not writer.done()
+            log_post("video2.mp4", "POSTED", "tiktok")
+            writer.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await writer
+
+        rows = in_memory_db.execute("SELECT filename FROM posts ORDER BY id").fetchall()
+        assert [row["filename"] for row in rows] == ["video1.mp4", "video2.mp4"]
+        assert "orphan.mp4" in caplog.text
+
+    async def test_bad_row_does_not_fail_shutdown(self, in_memory_db):
+        """Should flush valid rows on cancel without raising for a bad one."""
+        with patch.object(db, "conn", in_memory_db), \
+             patch.object(db, "LOG_FLUSH_INTERVAL", 10):
+            writer = asyncio.create_task(db.run_log_writer())
+            await asyncio.sleep(0)
+
+            log_post("orphan.mp4", "POSTED", "tiktok", user_id=999)
+            log_post("video1.mp4", "POSTED", "tiktok")
+            await asyncio.sleep(0)
+
+            writer.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await writer
+
+        count = in_memory_db.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        assert count == 1
+
+    async def test_pending_logs_flushed_on_shutdown(self, in_memory_db):
+        """Should write rows still queued when the writer is cancelled."""
+        with patch.object(db, "conn", in_memory_db), \
+             patch.object(db, "LOG_FLUSH_INTERVAL", 10):
+            writer = asyncio.create_task(db.run_log_writer())
+            await asyncio.sleep(0)
+
+            log_post("video1.mp4", "POSTED", "tiktok")
+            log_post("video2.mp4", "POSTED", "tiktok")
+            await asyncio.sleep(0)
+
+            writer.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await writer
+
+            assert db._log_queue is None
+            count = in_memory_db.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            assert count == 2
+
 
 class TestUserFunctions:
     """Tests for user database functions."""
@@ -63,6 +207,15 @@ class TestUserFunctions:
             user_id = create_user("testuser", "hashed_password")
             assert user_id > 0
 
+    def test_create_user_returns_sequential_ids(self, in_memory_db):
+        """Should return the ID of each inserted row."""
+        with patch.object(db, "conn", in_memory_db):
+            first = create_user("first", "hash")
+            second = create_user("second", "hash")
+
+            assert second == first + 1
+            assert db.get_user_by_id(second)["username"] == "second"
+
     def test_get_user_by_username(self, in_memory_db):
         """Should retrieve user by username."""
         with patch.object(db, "conn", in_memory_db):
@@ -73,6 +226,16 @@ class TestUserFunctions:
             assert user["username"] == "testuser"
             assert user["password_hash"] == "hashed_password"
 
+    def test_get_user_by_id_returns_plain_dict(self, in_memory_db):
+        """Should return a dict keyed by column name."""
+        with patch.object(db, "conn", in_memory_db):
+            user_id = create_user("testuser", "hashed_password")
+            user = db.get_user_by_id(user_id)
+
+            assert type(user) is dict
+            assert set(user) == {"id", "username", "password_hash", "created_at"}
+            assert user["id"] == user_id
+
     def test_get_nonexistent_user(self, in_memory_db):
         """Should return None for nonexistent user."""
         with patch.object(db, "conn", in_memory_db):
@@ -94,6 +257,15 @@ class TestTikTokTokens:
             assert tokens["refresh_token"] == "refresh_456"
             assert tokens["expires_at"] == 3600
 
+    def test_has_tiktok_linked(self, in_memory_db):
+        """Should report whether a user has stored tokens."""
+        with patch.object(db, "conn", in_memory_db):
+            user_id = create_user("testuser", "hash")
+            assert db.has_tiktok_linked(user_id) is False
+
+            save_tiktok_tokens(user_id, "access_123")
+            assert db.has_tiktok_linked(user_id) is True
+
     def test_get_tokens_no_tokens(self, in_memory_db):
         """Should return None when user has no tokens."""
         with patch.object(db, "conn", in_memory_db):
@@ -111,6 +283,35 @@ class TestTikTokTokens:
             tokens = get_tiktok_tokens(user_id)
             assert tokens["access_token"] == "new_token"
 
+            count = in_memory_db.execute("SELECT COUNT(*) FROM tiktok_tokens").fetchone()[0]
+            assert count == 1
+
+    def test_init_db_deduplicates_legacy_tokens(self, in_memory_db):
+        """Should keep only the newest token row per user when migrating."""
+        in_memory_db.execute("DROP INDEX idx_tiktok_user")
+        with patch.object(db, "conn", in_memory_db):
+            user_id = create_user("testuser", "hash")
+        in_memory_db.executemany(
+            "INSERT INTO tiktok_tokens (user_id, access_token) VALUES (?, ?)",
+            [(user_id, "old_token"), (user_id, "new_token")],
+        )
+
+        db.init_db(in_memory_db)
+
+        rows = in_memory_db.execute("SELECT access_token FROM tiktok_tokens").fetchall()
+        assert [row["access_token"] for row in rows] == ["new_token"]
+
+    def test_init_db_skips_migration_once_indexed(self, in_memory_db):
+        """Should not rescan tiktok_tokens once the unique index exists."""
+        statements = []
+        in_memory_db.set_trace_callback(statements.append)
+        try:
+            db.init_db(in_memory_db)
+        finally:
+            in_memory_db.set_trace_callback(None)
+
+        assert not any(statement.startswith("DELETE") for statement in statements)
+
 
 class TestDatabaseConnection:
     """Tests for database connection handling."""
@@ -126,3 +327,67 @@ class TestDatabaseConnection:
             "SELECT name FROM sqlite_master WHERE type='table' AND name='users'"
         )
         assert cursor.fetchone() is not None
+
+    def test_connection_uses_wal_mode(self):
+        """Should open the database in WAL journal mode."""
+        cursor = db.conn.execute("PRAGMA journal_mode")
+        assert cursor.fetchone()[0] == "wal"
+
+    def test_connection_uses_normal_synchronous(self):
+        """Should relax synchronous to NORMAL (1) under WAL."""
+        cursor = db.conn.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1
+
+
+class TestDatabaseSchema:
+    """Tests for the table layout created by init_db."""
+
+    def _columns(self, conn, table):
+        return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+    def test_posts_columns(self, in_memory_db):
+        """Should create posts with the columns log_post writes."""
+        assert self._columns(in_memory_db, "posts") == [
+            "id", "user_id", "filename", "status", "platform", "response", "created_at",
+        ]
+
+    def test_users_columns(self, in_memory_db):
+        """Should create users with credentials and a creation timestamp."""
+        assert self._columns(in_memory_db, "users") == ["id", "username", "password_hash", "created_at"]
+
+    def test_tiktok_tokens_columns(self, in_memory_db):
+        """Should create tiktok_tokens with access, refresh and expiry fields."""
+        assert self._columns(in_memory_db, "tiktok_tokens") == [
+            "id", "user_id", "access_token", "refresh_token", "expires_at", "created_at",
+        ]
+
+    def test_posts_created_at_defaults(self, in_memory_db):
+        """Should fill created_at automatically."""
+        with patch.object(db, "conn", in_memory_db):
+            log_post("test_video.mp4", "POSTED", "tiktok")
+
+            cursor = in_memory_db.execute("SELECT created_at FROM posts")
+            assert cursor.fetchone()[0] is not None
+
+
+class TestIndexes:
+    """Tests for lookup indexes."""
+
+    def _plan(self, conn, sql, params):
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        return " ".join(row[3] for row in rows)
+
+    def test_tiktok_tokens_lookup_uses_index(self, in_memory_db):
+        """Should serve get_tiktok_tokens from the unique user_id index."""
+        plan = self._plan(in_memory_db, db.SQL_GET_TIKTOK_TOKENS, (1,))
+        assert "idx_tiktok_user" in plan
+
+    def test_has_tiktok_linked_uses_index(self, in_memory_db):
+        """Should not scan tiktok_tokens when checking for a linked account."""
+        plan = self._plan(in_memory_db, db.SQL_HAS_TIKTOK_TOKENS, (1,))
+        assert "idx_tiktok_user" in plan
+
+    def test_username_lookup_uses_unique_index(self, in_memory_db):
+        """Should use the implicit UNIQUE index for username lookups."""
+        plan = self._plan(in_memory_db, db.SQL_GET_USER_BY_USERNAME, ("testuser",))
+        assert "USING INDEX" in plan
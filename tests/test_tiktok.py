@@ -1,8 +1,14 @@
 """Unit tests for TikTok API integration."""
 
+import asyncio
+import json
+import mmap
 import os
+import time
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+import requests
 
 import tiktok
 from tiktok import (
@@ -19,6 +25,37 @@ from tiktok import (
 )
 
 
+def _json_body(data):
+    """Encode data the way the TikTok API would send it back."""
+    return json.dumps(data).encode()
+
+
+def _expected_chunks(content, chunk_size):
+    """Map each Content-Range TikTok expects to its bytes; the last chunk runs to the end."""
+    file_size = len(content)
+    count = max(1, file_size // chunk_size)
+    chunks = {}
+    for index in range(count):
+        start = index * chunk_size
+        end = file_size if index == count - 1 else start + chunk_size
+        chunks[f"bytes {start}-{end - 1}/{file_size}"] = content[start:end]
+    return chunks
+
+
+@pytest.fixture(autouse=True)
+def reset_config():
+    """Re-read OAuth settings from each test's environment."""
+    tiktok._reset_config_cache()
+    yield
+    tiktok._reset_config_cache()
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    """Retry failed chunk uploads without sleeping between attempts."""
+    monkeypatch.setattr(tiktok, "RETRY_BACKOFF", 0)
+
+
 class TestGetAccessToken:
     """Tests for get_access_token function."""
 
@@ -43,14 +80,56 @@ class TestOAuthFunctions:
             "TIKTOK_CLIENT_KEY": "test_key",
             "TIKTOK_REDIRECT_URI": "http://localhost:8000/callback",
         }):
-            import importlib
-            importlib.reload(tiktok)
-
             auth_url, state = tiktok.get_authorization_url()
             assert "tiktok.com" in auth_url
             assert "test_key" in auth_url
             assert len(state) > 20
 
+    def test_get_authorization_url_uses_given_state(self):
+        """Should embed a caller-provided state."""
+        with patch.dict(os.environ, {
+            "TIKTOK_CLIENT_KEY": "test_key",
+            "TIKTOK_REDIRECT_URI": "http://localhost:8000/callback",
+        }):
+            auth_url, state = tiktok.get_authorization_url("signed.state")
+            assert state == "signed.state"
+            assert "state=signed.state" in auth_url
+
+    def test_get_authorization_url_params(self):
+        """Should encode the same query parameters as a full urlencode."""
+        from urllib.parse import parse_qs, urlsplit
+
+        with patch.dict(os.environ, {
+            "TIKTOK_CLIENT_KEY": "test_key",
+            "TIKTOK_REDIRECT_URI": "http://localhost:8000/callback",
+        }):
+            auth_url, _ = tiktok.get_authorization_url("a b&c")
+
+        assert parse_qs(urlsplit(auth_url).query) == {
+            "client_key": ["test_key"],
+            "scope": ["user.info.basic,video.upload,video.publish"],
+            "response_type": ["code"],
+            "redirect_uri": ["http://localhost:8000/callback"],
+            "state": ["a b&c"],
+        }
+
+    def test_config_cached_until_reset(self):
+        """Should keep using the first configuration read until the cache is reset."""
+        with patch.dict(os.environ, {"TIKTOK_CLIENT_KEY": "first_key"}):
+            assert "first_key" in tiktok.get_authorization_url()[0]
+
+        with patch.dict(os.environ, {"TIKTOK_CLIENT_KEY": "second_key"}):
+            assert "first_key" in tiktok.get_authorization_url()[0]
+            tiktok._reset_config_cache()
+            assert "second_key" in tiktok.get_authorization_url()[0]
+
+    def test_get_authorization_url_missing_config(self):
+        """Should raise MissingOAuthConfigError without a client key."""
+        env = {k: v for k, v in os.environ.items() if k != "TIKTOK_CLIENT_KEY"}
+        with patch.dict(os.environ, env, clear=True):
+            with pytest.raises(tiktok.MissingOAuthConfigError):
+                tiktok.get_authorization_url()
+
     def test_exchange_code_for_token_success(self):
         """Should exchange code for token."""
         mock_response = {
@@ -64,24 +143,62 @@ class TestOAuthFunctions:
             "TIKTOK_CLIENT_KEY": "test_key",
             "TIKTOK_CLIENT_SECRET": "test_secret",
             "TIKTOK_REDIRECT_URI": "http://localhost:8000/callback",
-        }), patch("tiktok.requests.post") as mock_post:
-            mock_post.return_value.status_code = 200
-            mock_post.return_value.json.return_value = mock_response
-
-            import importlib
-            importlib.reload(tiktok)
+        }):
+            with patch("tiktok._SESSION.post") as mock_post:
+                mock_post.return_value.status_code = 200
+                mock_post.return_value.content = _json_body(mock_response)
 
-            result = tiktok.exchange_code_for_token("test_code")
+                result = tiktok.exchange_code_for_token("test_code")
             assert result["access_token"] == "test_access_token"
 
+    def test_refresh_access_token_success(self):
+        """Should request a new token with the refresh_token grant."""
+        mock_response = {
+            "access_token": "new_access_token",
+            "refresh_token": "new_refresh_token",
+            "expires_in": 86400,
+            "token_type": "Bearer",
+        }
+
+        with patch.dict(os.environ, {
+            "TIKTOK_CLIENT_KEY": "test_key",
+            "TIKTOK_CLIENT_SECRET": "test_secret",
+        }):
+            with patch("tiktok._SESSION.post") as mock_post:
+                mock_post.return_value.status_code = 200
+                mock_post.return_value.content = _json_body(mock_response)
+
+                result = tiktok.refresh_access_token("old_refresh_token")
+
+        assert result["access_token"] == "new_access_token"
+        sent = mock_post.call_args.kwargs["data"]
+        assert sent["grant_type"] == "refresh_token"
+        assert sent["refresh_token"] == "old_refresh_token"
+
+    def test_refresh_access_token_error(self):
+        """Should raise TikTokAPIError when the refresh is rejected."""
+        with patch.dict(os.environ, {
+            "TIKTOK_CLIENT_KEY": "test_key",
+            "TIKTOK_CLIENT_SECRET": "test_secret",
+        }):
+            with patch("tiktok._SESSION.post") as mock_post:
+                mock_post.return_value.status_code = 400
+                mock_post.return_value.content = _json_body({
+                    "error": "invalid_grant",
+                    "error_description": "Refresh token is invalid or expired.",
+                })
+
+                with pytest.raises(tiktok.TikTokAPIError):
+                    tiktok.refresh_access_token("old_refresh_token")
+
 
 class TestInitVideoUpload:
     """Tests for _init_video_upload function."""
 
     def test_successful_init(self, mock_access_token, mock_tiktok_init_response):
         """Should return publish_id and upload_url on success."""
-        with patch("tiktok.requests.post") as mock_post:
-            mock_post.return_value.json.return_value = mock_tiktok_init_response
+        with patch("tiktok._SESSION.post") as mock_post:
+            mock_post.return_value.content = _json_body(mock_tiktok_init_response)
 
             result = _init_video_upload(mock_access_token, 1000000)
 
@@ -90,8 +207,8 @@ class TestInitVideoUpload:
 
     def test_api_error_response(self, mock_access_token, mock_tiktok_error_response):
         """Should raise TikTokAPIError on error response."""
-        with patch("tiktok.requests.post") as mock_post:
-            mock_post.return_value.json.return_value = mock_tiktok_error_response
+        with patch("tiktok._SESSION.post") as mock_post:
+            mock_post.return_value.content = _json_body(mock_tiktok_error_response)
 
             with pytest.raises(tiktok.TikTokAPIError):
                 _init_video_upload(mock_access_token, 1000000)
@@ -102,7 +219,7 @@ class TestUploadVideoChunks:
 
     def test_successful_single_chunk_upload(self, mock_video_file):
         """Should successfully upload a small file in one chunk."""
-        with patch("tiktok.requests.put") as mock_put:
+        with patch("tiktok._SESSION.put") as mock_put:
             mock_put.return_value.status_code = 200
 
             _upload_video_chunks(
@@ -113,9 +230,74 @@ class TestUploadVideoChunks:
 
             mock_put.assert_called_once()
 
+    def test_single_chunk_streams_file(self, mock_video_file):
+        """Should send a file that fits in one chunk from its mapping, block by block."""
+        file_size = os.path.getsize(mock_video_file)
+        sent = []
+
+        def put(url, data, headers):
+            sent.append((len(data), b"".join(iter(data.read, b"")), headers["Content-Range"]))
+            return MagicMock(status_code=201)
+
+        with patch("tiktok._SESSION.put", side_effect=put):
+            _upload_video_chunks("https://upload.example.com", mock_video_file, file_size)
+
+        with open(mock_video_file, "rb") as f:
+            assert sent == [(file_size, f.read(), f"bytes 0-{file_size - 1}/{file_size}")]
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_reports_progress(self, mock_video_file, concurrency):
+        """Should report cumulative bytes after every chunk, ending at the file size."""
+        file_size = os.path.getsize(mock_video_file)
+        calls = []
+
+        with patch.object(tiktok, "CHUNK_SIZE", 4096), \
+             patch.object(tiktok, "MAX_UPLOAD_CONCURRENCY", concurrency), \
+             patch("tiktok._SESSION.put") as mock_put:
+            mock_put.return_value.status_code = 201
+            _upload_video_chunks("https://upload.example.com", mock_video_file, file_size, lambda *args: calls.append(args))
+            chunk_count = len(tiktok._chunk_ranges(file_size))
+
+        assert chunk_count > 1
+        assert len(calls) == chunk_count
+        assert sorted(index for _, _, index in calls) == list(range(chunk_count))
+        assert [uploaded for uploaded, _, _ in calls] == sorted(uploaded for uploaded, _, _ in calls)
+        assert calls[-1][:2] == (file_size, file_size)
+
     def test_upload_failure_raises_error(self, mock_video_file):
         """Should raise TikTokAPIError on upload failure."""
-        with patch("tiktok.requests.put") as mock_put:
+        with patch("tiktok._SESSION.put") as mock_put:
+            mock_put.return_value.status_code = 500
+
+            with pytest.raises(tiktok.TikTokAPIError):
+                _upload_video_chunks(
+                    "https://upload.example.com",
+                    mock_video_file,
+                    os.path.getsize(mock_video_file),
+                )
+
+    def test_multiple_chunks_uploaded_concurrently(self, mock_video_file):
+        """Should PUT every chunk with its own byte range."""
+        file_size = os.path.getsize(mock_video_file)
+        sent = {}
+
+        def put(url, data, headers):
+            sent[headers["Content-Range"]] = data.read()
+            return MagicMock(status_code=206)
+
+        with patch.object(tiktok, "CHUNK_SIZE", 4096), \
+             patch.object(tiktok, "MAX_UPLOAD_CONCURRENCY", 4), \
+             patch("tiktok._SESSION.put", side_effect=put):
+            _upload_video_chunks("https://upload.example.com", mock_video_file, file_size)
+
+        with open(mock_video_file, "rb") as f:
+            assert sent == _expected_chunks(f.read(), 4096)
+
+    def test_multiple_chunks_failure_raises_error(self, mock_video_file):
+        """Should raise TikTokAPIError when any concurrent chunk fails."""
+        with patch.object(tiktok, "CHUNK_SIZE", 4096), \
+             patch.object(tiktok, "MAX_UPLOAD_CONCURRENCY", 4), \
+             patch("tiktok._SESSION.put") as mock_put:
             mock_put.return_value.status_code = 500
 
             with pytest.raises(tiktok.TikTokAPIError):
@@ -126,26 +308,374 @@ class TestUploadVideoChunks:
                 )
 
 
+class TestChunkRetries:
+    """Tests for retrying and resuming a single chunk upload."""
+
+    def _upload(self, mock_video_file, *responses):
+        chunk = tiktok._chunk_ranges(os.path.getsize(mock_video_file))[0]
+        with patch("tiktok._SESSION.put", side_effect=list(responses)) as mock_put:
+            tiktok._upload_chunk("https://upload.example.com", mock_video_file, os.path.getsize(mock_video_file), chunk)
+        return mock_put
+
+    def test_retries_transient_status(self, mock_video_file):
+        """Should retry a 503 and succeed on the next attempt."""
+        mock_put = self._upload(mock_video_file, MagicMock(status_code=503), MagicMock(status_code=201))
+        assert mock_put.call_count == 2
+
+    def test_retries_connection_error(self, mock_video_file):
+        """Should retry when the connection drops."""
+        mock_put = self._upload(mock_video_file, requests.ConnectionError(), MagicMock(status_code=201))
+        assert mock_put.call_count == 2
+
+    def test_gives_up_after_max_retries(self, mock_video_file):
+        """Should raise once MAX_RETRIES retries have failed."""
+        with patch.object(tiktok, "MAX_RETRIES", 2):
+            with pytest.raises(tiktok.TikTokAPIError, match="status 503"):
+                self._upload(mock_video_file, *[MagicMock(status_code=503)] * 3)
+
+    def test_client_error_not_retried(self, mock_video_file):
+        """Should fail immediately on a non-transient status."""
+        with patch("tiktok._SESSION.put", return_value=MagicMock(status_code=400)) as mock_put:
+            with pytest.raises(tiktok.TikTokAPIError):
+                _upload_video_chunks("https://upload.example.com", mock_video_file, os.path.getsize(mock_video_file))
+        assert mock_put.call_count == 1
+
+    def test_resumes_from_server_range(self, mock_video_file):
+        """Should send only the bytes after the Range a 308 reports."""
+        file_size = os.path.getsize(mock_video_file)
+        sent = []
+
+        def put(url, data, headers):
+            sent.append((headers["Content-Range"], data.read()))
+            if len(sent) == 1:
+                return MagicMock(status_code=308, headers={"Range": "bytes=0-9999"})
+            return MagicMock(status_code=201)
+
+        chunk = tiktok._chunk_ranges(file_size)[0]
+        with patch("tiktok._SESSION.put", side_effect=put):
+            tiktok._upload_chunk("https://upload.example.com", mock_video_file, file_size, chunk)
+
+        with open(mock_video_file, "rb") as f:
+            content = f.read()
+        assert sent[1] == (f"bytes 10000-{file_size - 1}/{file_size}", content[10000:])
+
+    def test_remaining_chunk(self):
+        """Should work out what is left of a chunk from a Range header."""
+        chunk = tiktok._make_chunk(1, 100, 100, 250)
+
+        assert tiktok._remaining_chunk(chunk, 250, None) == chunk
+        assert tiktok._remaining_chunk(chunk, 250, "bytes=0-149").headers["Content-Range"] == "bytes 150-199/250"
+        assert tiktok._remaining_chunk(chunk, 250, "bytes=0-199") is None
+
+    def test_retry_delay_is_capped(self):
+        """Should back off exponentially up to RETRY_BACKOFF_MAX."""
+        with patch.object(tiktok, "RETRY_BACKOFF", 0.5):
+            assert [tiktok._retry_delay(n) for n in (1, 2, 3)] == [0.5, 1, 2]
+            assert tiktok._retry_delay(20) == tiktok.RETRY_BACKOFF_MAX
+
+
+class TestChunkRanges:
+    """Tests for splitting a file into chunk uploads."""
+
+    def test_ranges_and_headers(self):
+        """Should cover the file exactly, folding the remainder into the final chunk."""
+        with patch.object(tiktok, "CHUNK_SIZE", 100):
+            chunks = tiktok._chunk_ranges(250)
+
+        assert [(chunk.index, chunk.offset, chunk.length) for chunk in chunks] == [(0, 0, 100), (1, 100, 150)]
+        assert chunks[1].headers == {
+            "Content-Type": "video/mp4",
+            "Content-Length": "150",
+            "Content-Range": "bytes 100-249/250",
+        }
+
+    def test_chunk_count_matches_init_payload(self):
+        """Should produce as many chunks as the init request announces."""
+        with patch.object(tiktok, "CHUNK_SIZE", 100):
+            for file_size in (1, 100, 101, 250):
+                payload = tiktok._init_payload(file_size)
+                assert len(tiktok._chunk_ranges(file_size)) == payload["source_info"]["total_chunk_count"]
+
+    def test_remainder_joins_last_chunk(self):
+        """Should send a video shorter than two chunks as one chunk, as TikTok expects."""
+        file_size = 6 * tiktok.MB
+        payload = tiktok._init_payload(file_size)
+
+        assert payload["source_info"]["chunk_size"] == tiktok.MIN_CHUNK_SIZE
+        assert payload["source_info"]["total_chunk_count"] == 1
+        assert [chunk.length for chunk in tiktok._chunk_ranges(file_size)] == [file_size]
+
+    @pytest.mark.parametrize("value, expected", [
+        ("", None),
+        ("0", None),
+        ("-4096", 5 * 1024 * 1024),
+        ("1024", 5 * 1024 * 1024),
+        (str(16 * 1024 * 1024), 16 * 1024 * 1024),
+        (str(1024 * 1024 * 1024), 64 * 1024 * 1024),
+    ])
+    def test_chunk_size_override_clamped(self, monkeypatch, value, expected):
+        """Should keep TIKTOK_CHUNK_SIZE within TikTok's 5MB-64MB range."""
+        if value:
+            monkeypatch.setenv("TIKTOK_CHUNK_SIZE", value)
+        else:
+            monkeypatch.delenv("TIKTOK_CHUNK_SIZE", raising=False)
+        assert tiktok._chunk_size_override() == expected
+
+    def test_small_file_is_one_chunk(self):
+        """Should send videos up to MIN_CHUNK_SIZE as a single chunk."""
+        for file_size in (1, 1000, tiktok.MIN_CHUNK_SIZE):
+            payload = tiktok._init_payload(file_size)
+            assert payload["source_info"]["chunk_size"] == file_size
+            assert payload["source_info"]["total_chunk_count"] == 1
+
+    def test_chunk_size_scales_with_file_size(self):
+        """Should grow with the file, staying within TikTok's limits."""
+        with patch.object(tiktok, "MAX_UPLOAD_CONCURRENCY", 8):
+            assert tiktok._choose_chunk_size(tiktok.MIN_CHUNK_SIZE + 1) == tiktok.MIN_CHUNK_SIZE
+            assert tiktok._choose_chunk_size(500 * tiktok.MB) == 16 * tiktok.MB
+            assert tiktok._choose_chunk_size(10 * 1024 * tiktok.MB) == tiktok.MAX_CHUNK_SIZE
+
+
+class TestSendfileUpload:
+    """Tests for zero-copy chunk uploads to plain HTTP upload URLs."""
+
+    @pytest.fixture
+    def upload_server(self):
+        """Run a local HTTP server that records chunk PUTs; yields (url, received)."""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        received = {"chunks": {}, "status": 201, "peers": set(), "delay": 0}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_PUT(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                received["chunks"][self.headers["Content-Range"]] = (self.path, body)
+                received["peers"].add(self.client_address)
+                time.sleep(received["delay"])
+                self.send_response(received["status"])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}/upload?upload_id=test123", received
+        server.shutdown()
+        server.server_close()
+
+    def test_chunks_sent_with_sendfile(self, upload_server, mock_video_file):
+        """Should deliver every chunk intact without going through requests."""
+        upload_url, received = upload_server
+        file_size = os.path.getsize(mock_video_file)
+
+        with patch.object(tiktok, "CHUNK_SIZE", 4096), \
+             patch("tiktok._SESSION.put") as mock_put:
+            _upload_video_chunks(upload_url, mock_video_file, file_size)
+
+        mock_put.assert_not_called()
+        with open(mock_video_file, "rb") as f:
+            expected = _expected_chunks(f.read(), 4096)
+        assert received["chunks"] == {
+            content_range: ("/upload?upload_id=test123", body) for content_range, body in expected.items()
+        }
+
+    def test_worker_reuses_its_connection(self, upload_server, mock_video_file):
+        """Should send every chunk of a sequential upload over one keep-alive connection."""
+        upload_url, received = upload_server
+        file_size = os.path.getsize(mock_video_file)
+
+        with patch.object(tiktok, "CHUNK_SIZE", 4096), \
+             patch.object(tiktok, "MAX_UPLOAD_CONCURRENCY", 1):
+            _upload_video_chunks(upload_url, mock_video_file, file_size)
+
+        assert len(received["chunks"]) > 1
+        assert len(received["peers"]) == 1
+
+    def test_sendfile_skips_mmap(self, upload_server, mock_video_file):
+        """Should not map the file when the chunk goes out with sendfile."""
+        upload_url, _ = upload_server
+
+        with patch("tiktok.mmap.mmap") as mock_mmap:
+            _upload_video_chunks(upload_url, mock_video_file, os.path.getsize(mock_video_file))
+
+        mock_mmap.assert_not_called()
+
+    def test_stalled_server_times_out(self, upload_server, mock_video_file):
+        """Should give up on a chunk PUT that gets no response within SENDFILE_TIMEOUT."""
+        upload_url, received = upload_server
+        received["delay"] = 0.5
+
+        with patch.object(tiktok, "SENDFILE_TIMEOUT", 0.05), \
+             patch.object(tiktok, "MAX_RETRIES", 0):
+            with pytest.raises(TimeoutError):
+                _upload_video_chunks(upload_url, mock_video_file, os.path.getsize(mock_video_file))
+
+    def test_sendfile_failure_raises_error(self, upload_server, mock_video_file):
+        """Should raise TikTokAPIError when the server rejects the chunk."""
+        upload_url, received = upload_server
+        received["status"] = 400
+
+        with pytest.raises(tiktok.TikTokAPIError):
+            _upload_video_chunks(upload_url, mock_video_file, os.path.getsize(mock_video_file))
+
+
+class TestChunkReader:
+    """Tests for streaming a chunk's byte range from a mapped file."""
+
+    @pytest.fixture
+    def mapped(self, mock_video_file):
+        """Read-only mapping of the mock video."""
+        with open(mock_video_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+    def test_reads_only_its_range(self, mapped):
+        """Should stop at the end of the chunk in READ_BLOCK_SIZE blocks."""
+        with patch.object(tiktok, "READ_BLOCK_SIZE", 100):
+            reader = tiktok._ChunkReader(mapped, 1000, 250)
+            blocks = iter(lambda: reader.read(), b"")
+            assert [len(block) for block in blocks] == [100, 100, 50]
+
+        assert len(reader) == 250
+
+    def test_seek_rewinds_for_retries(self, mapped):
+        """Should replay the same bytes after seeking back to the start."""
+        reader = tiktok._ChunkReader(mapped, 1000, 250)
+        first = reader.read()
+        reader.seek(0)
+        assert reader.read() == first == mapped[1000:1250]
+
+    def test_request_sent_with_content_length(self, mapped):
+        """Should let requests send a Content-Length instead of chunked encoding."""
+        prepared = requests.Request(
+            "PUT", "https://upload.example.com", data=tiktok._ChunkReader(mapped, 0, 250),
+        ).prepare()
+
+        assert prepared.headers["Content-Length"] == "250"
+        assert "Transfer-Encoding" not in prepared.headers
+
+
+class TestJSON:
+    """Tests for JSON encoding with and without orjson."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_round_trip(self, use_orjson):
+        """Should decode an encoded payload back to the same data."""
+        if use_orjson:
+            pytest.importorskip("orjson")
+            ctx = patch.object(tiktok, "orjson", tiktok.orjson)
+        else:
+            ctx = patch.object(tiktok, "orjson", None)
+
+        payload = {"post_info": {"title": "Video \u00e9", "disable_duet": False}, "video_size": 1000}
+        with ctx:
+            assert tiktok._loads(tiktok._dumps(payload)) == payload
+
+    def test_request_body_is_json(self, mock_access_token, mock_tiktok_status_response_success):
+        """Should send the encoded payload with the JSON content type."""
+        with patch("tiktok._SESSION.post") as mock_post:
+            mock_post.return_value.content = _json_body(mock_tiktok_status_response_success)
+            _check_publish_status(mock_access_token, "test_publish_id")
+
+        assert json.loads(mock_post.call_args.kwargs["data"]) == {"publish_id": "test_publish_id"}
+        assert mock_post.call_args.kwargs["headers"]["Content-Type"].startswith("application/json")
+
+
+class TestSession:
+    """Tests for the shared HTTP session."""
+
+    def test_https_adapter_pools_connections(self):
+        """Should mount a pooled adapter for HTTPS."""
+        adapter = tiktok._SESSION.get_adapter("https://open.tiktokapis.com")
+        assert adapter._pool_maxsize >= tiktok.MAX_UPLOAD_CONCURRENCY
+
+    def test_only_puts_are_retried(self):
+        """Should let the adapter replay idempotent chunk PUTs but never POSTs."""
+        retries = tiktok._SESSION.get_adapter("https://open.tiktokapis.com").max_retries
+        assert "PUT" in retries.allowed_methods
+        assert "POST" not in retries.allowed_methods
+
+    def test_adapter_leaves_status_retries_to_chunks(self):
+        """Should not retry on status codes, so chunk retries aren't multiplied."""
+        retries = tiktok._SESSION.get_adapter("https://open.tiktokapis.com").max_retries
+        assert not retries.is_retry("PUT", 503)
+
+    def test_warm_connection_heads_url(self):
+        """Should send a HEAD so a connection to the host is pooled."""
+        with patch("tiktok._SESSION.head") as mock_head:
+            tiktok._warm_connection(tiktok.TIKTOK_API_BASE)
+        mock_head.assert_called_once_with(tiktok.TIKTOK_API_BASE, timeout=2)
+
+    def test_warm_connection_ignores_errors(self):
+        """Should swallow network errors, since warming is best-effort."""
+        with patch("tiktok._SESSION.head", side_effect=requests.ConnectionError()):
+            tiktok._warm_connection(tiktok.TIKTOK_API_BASE)
+
+
 class TestCheckPublishStatus:
     """Tests for _check_publish_status function."""
 
     def test_successful_status_check(self, mock_access_token, mock_tiktok_status_response_success):
         """Should return status data on success."""
-        with patch("tiktok.requests.post") as mock_post:
-            mock_post.return_value.json.return_value = mock_tiktok_status_response_success
+        with patch("tiktok._SESSION.post") as mock_post:
+            mock_post.return_value.content = _json_body(mock_tiktok_status_response_success)
 
             result = _check_publish_status(mock_access_token, "test_publish_id")
             assert result["status"] == "PUBLISH_COMPLETE"
 
     def test_error_response(self, mock_access_token, mock_tiktok_error_response):
         """Should raise TikTokAPIError on error response."""
-        with patch("tiktok.requests.post") as mock_post:
-            mock_post.return_value.json.return_value = mock_tiktok_error_response
+        with patch("tiktok._SESSION.post") as mock_post:
+            mock_post.return_value.content = _json_body(mock_tiktok_error_response)
 
             with pytest.raises(tiktok.TikTokAPIError):
                 _check_publish_status(mock_access_token, "test_publish_id")
 
 
+class TestWaitForPublish:
+    """Tests for polling a publication until it finishes."""
+
+    def _status(self, status):
+        return {"status": status, "publish_id": "test_publish_id"}
+
+    def test_polls_with_capped_backoff(self, mock_access_token):
+        """Should poll until PUBLISH_COMPLETE, doubling the delay up to the cap."""
+        statuses = [self._status("PROCESSING_UPLOAD")] * 4 + [self._status("PUBLISH_COMPLETE")]
+
+        with patch("tiktok._check_publish_status", side_effect=statuses) as mock_check, \
+             patch("tiktok.time.sleep") as mock_sleep:
+            result = tiktok.wait_for_publish(mock_access_token, "test_publish_id", initial=1.0, cap=5.0)
+
+        assert result["status"] == "PUBLISH_COMPLETE"
+        assert mock_check.call_count == 5
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1.0, 2.0, 4.0, 5.0]
+
+    def test_stops_on_failure(self, mock_access_token):
+        """Should return a FAILED status without polling again."""
+        with patch("tiktok._check_publish_status", return_value=self._status("FAILED")) as mock_check, \
+             patch("tiktok.time.sleep") as mock_sleep:
+            result = tiktok.wait_for_publish(mock_access_token, "test_publish_id")
+
+        assert result["status"] == "FAILED"
+        mock_check.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_returns_last_status_on_timeout(self, mock_access_token):
+        """Should give up once the next wait would pass the timeout."""
+        with patch("tiktok._check_publish_status", return_value=self._status("PROCESSING_UPLOAD")) as mock_check, \
+             patch("tiktok.time.sleep") as mock_sleep:
+            result = tiktok.wait_for_publish(mock_access_token, "test_publish_id", timeout=0.5, initial=1.0)
+
+        assert result["status"] == "PROCESSING_UPLOAD"
+        mock_check.assert_called_once()
+        mock_sleep.assert_not_called()
+
+
 class TestPostVideo:
     """Tests for the main post_video function."""
 
@@ -154,11 +684,11 @@ class TestPostVideo:
         mock_tiktok_init_response, mock_tiktok_status_response_success,
     ):
         """Should successfully post a video and return result."""
-        with patch("tiktok.requests.post") as mock_post, \
-             patch("tiktok.requests.put") as mock_put:
-            mock_post.return_value.json.side_effect = [
-                mock_tiktok_init_response,
-                mock_tiktok_status_response_success,
+        with patch("tiktok._SESSION.post") as mock_post, \
+             patch("tiktok._SESSION.put") as mock_put:
+            mock_post.side_effect = [
+                MagicMock(content=_json_body(mock_tiktok_init_response)),
+                MagicMock(content=_json_body(mock_tiktok_status_response_success)),
             ]
             mock_put.return_value.status_code = 200
 
@@ -167,16 +697,76 @@ class TestPostVideo:
             assert result["success"] is True
             assert result["publish_id"] == "test_publish_id_12345"
 
+    def test_post_waits_for_processing(
+        self, env_with_token, mock_video_file, mock_tiktok_init_response,
+        mock_tiktok_status_response_processing, mock_tiktok_status_response_success,
+    ):
+        """Should poll the publish status until processing finishes."""
+        with patch("tiktok._SESSION.post") as mock_post, \
+             patch("tiktok._SESSION.put") as mock_put, \
+             patch("tiktok.time.sleep"):
+            mock_post.side_effect = [
+                MagicMock(content=_json_body(mock_tiktok_init_response)),
+                MagicMock(content=_json_body(mock_tiktok_status_response_processing)),
+                MagicMock(content=_json_body(mock_tiktok_status_response_success)),
+            ]
+            mock_put.return_value.status_code = 200
+
+            result = post_video(mock_video_file)
+
+        assert result["status"] == "PUBLISH_COMPLETE"
+        assert mock_post.call_count == 3
+
+    def test_failed_publish_raises(
+        self, env_with_token, mock_video_file, mock_tiktok_init_response,
+    ):
+        """Should raise TikTokAPIError when TikTok reports the publication FAILED."""
+        failed = {"data": {"status": "FAILED", "fail_reason": "file_format_check_failed"}, "error": {"code": "ok"}}
+        with patch("tiktok._SESSION.post") as mock_post, \
+             patch("tiktok._SESSION.put") as mock_put:
+            mock_post.side_effect = [
+                MagicMock(content=_json_body(mock_tiktok_init_response)),
+                MagicMock(content=_json_body(failed)),
+            ]
+            mock_put.return_value.status_code = 200
+
+            with pytest.raises(TikTokAPIError) as exc_info:
+                post_video(mock_video_file)
+
+        assert exc_info.value.code == "publish_failed"
+        assert exc_info.value.message == "file_format_check_failed"
+
+    def test_post_without_wait_checks_status_once(
+        self, env_with_token, mock_video_file,
+        mock_tiktok_init_response, mock_tiktok_status_response_processing,
+    ):
+        """Should report a video still processing as not yet successful, without polling."""
+        with patch("tiktok._SESSION.post") as mock_post, \
+             patch("tiktok._SESSION.put") as mock_put, \
+             patch("tiktok.time.sleep") as mock_sleep:
+            mock_post.side_effect = [
+                MagicMock(content=_json_body(mock_tiktok_init_response)),
+                MagicMock(content=_json_body(mock_tiktok_status_response_processing)),
+            ]
+            mock_put.return_value.status_code = 200
+
+            result = post_video(mock_video_file, wait=False)
+
+        assert result["success"] is False
+        assert result["status"] == "PROCESSING_UPLOAD"
+        assert mock_post.call_count == 2
+        mock_sleep.assert_not_called()
+
     def test_post_with_provided_token(
         self, mock_video_file,
         mock_tiktok_init_response, mock_tiktok_status_response_success,
     ):
         """Should use provided access token instead of environment."""
-        with patch("tiktok.requests.post") as mock_post, \
-             patch("tiktok.requests.put") as mock_put:
-            mock_post.return_value.json.side_effect = [
-                mock_tiktok_init_response,
-                mock_tiktok_status_response_success,
+        with patch("tiktok._SESSION.post") as mock_post, \
+             patch("tiktok._SESSION.put") as mock_put:
+            mock_post.side_effect = [
+                MagicMock(content=_json_body(mock_tiktok_init_response)),
+                MagicMock(content=_json_body(mock_tiktok_status_response_success)),
             ]
             mock_put.return_value.status_code = 200
 
@@ -196,6 +786,187 @@ class TestPostVideo:
             post_video("/nonexistent/path/video.mp4")
 
 
+class TestPostVideosBatch:
+    """Tests for posting several videos at once."""
+
+    def test_results_in_input_order(self):
+        """Should return one result per path, in the order given."""
+        def post(path, token):
+            return {"success": True, "publish_id": f"id-{path}"}
+
+        with patch("tiktok.post_video", side_effect=post):
+            results = tiktok.post_videos_batch(["a.mp4", "b.mp4", "c.mp4"], "token", max_concurrency=2)
+
+        assert [result["publish_id"] for result in results] == ["id-a.mp4", "id-b.mp4", "id-c.mp4"]
+
+    def test_failure_does_not_stop_batch(self):
+        """Should report a failed video in its slot and still post the others."""
+        def post(path, token):
+            if path == "missing.mp4":
+                raise FileNotFoundError(f"Video file not found: {path}")
+            return {"success": True, "publish_id": "ok"}
+
+        with patch("tiktok.post_video", side_effect=post):
+            results = tiktok.post_videos_batch(["a.mp4", "missing.mp4", "b.mp4"], "token")
+
+        assert [result["success"] for result in results] == [True, False, True]
+        assert results[1]["path"] == "missing.mp4"
+        assert "not found" in results[1]["error"]
+
+    def test_non_json_response_does_not_stop_batch(
+        self, tmp_path, mock_tiktok_init_response, mock_tiktok_status_response_success,
+    ):
+        """Should report a video whose API response isn't JSON and still post the others."""
+        paths = []
+        for name, size in (("a.mp4", 100), ("bad.mp4", 200), ("b.mp4", 300)):
+            path = tmp_path / name
+            path.write_bytes(b"\0" * size)
+            paths.append(str(path))
+
+        def post(url, data, headers):
+            if url.endswith("/status/fetch/"):
+                return MagicMock(content=_json_body(mock_tiktok_status_response_success))
+            if json.loads(data)["source_info"]["video_size"] == 200:
+                return MagicMock(content=b"<html>502 Bad Gateway</html>")
+            return MagicMock(content=_json_body(mock_tiktok_init_response))
+
+        with patch("tiktok._SESSION.post", side_effect=post), \
+             patch("tiktok._SESSION.put") as mock_put:
+            mock_put.return_value.status_code = 201
+            results = tiktok.post_videos_batch(paths, "token")
+
+        assert [result["success"] for result in results] == [True, False, True]
+        assert results[1]["path"] == paths[1]
+
+    def test_missing_token_raises(self, env_without_token):
+        """Should fail the whole batch up front without a token."""
+        with pytest.raises(MissingTokenError):
+            tiktok.post_videos_batch(["a.mp4"])
+
+
+class TestPostVideoAsync:
+    """Tests for post_video_async against a local aiohttp server."""
+
+    @pytest.fixture
+    async def tiktok_server(self, mock_tiktok_status_response_success):
+        """Serve fake init, chunk upload and status endpoints; yields received chunks."""
+        web = pytest.importorskip("aiohttp.web")
+        from aiohttp.test_utils import TestServer
+
+        received = {"chunks": {}, "fail_upload": False, "fail_once": False, "attempts": 0}
+
+        async def init(request):
+            base = str(request.url.origin())
+            return web.json_response({
+                "data": {"publish_id": "async_publish_id", "upload_url": f"{base}/upload"},
+                "error": {"code": "ok", "message": ""},
+            })
+
+        async def upload(request):
+            received["attempts"] += 1
+            body = await request.read()
+            if received["fail_once"]:
+                received["fail_once"] = False
+                return web.Response(status=503)
+            received["chunks"][request.headers["Content-Range"]] = body
+            return web.Response(status=500 if received["fail_upload"] else 206)
+
+        async def status(request):
+            return web.json_response(mock_tiktok_status_response_success)
+
+        app = web.Application()
+        app.router.add_post("/v2/post/publish/video/init/", init)
+        app.router.add_put("/upload", upload)
+        app.router.add_post("/v2/post/publish/status/fetch/", status)
+
+        async with TestServer(app) as server:
+            with patch.object(tiktok, "TIKTOK_API_BASE", str(server.make_url("")).rstrip("/")):
+                yield received
+
+    async def test_successful_post(self, tiktok_server, mock_video_file):
+        """Should upload every chunk and return the publish result."""
+        with patch.object(tiktok, "CHUNK_SIZE", 4096):
+            result = await tiktok.post_video_async(mock_video_file, access_token="custom_token")
+
+        assert result == {"success": True, "publish_id": "async_publish_id", "status": "PUBLISH_COMPLETE"}
+
+        with open(mock_video_file, "rb") as f:
+            assert tiktok_server["chunks"] == _expected_chunks(f.read(), 4096)
+
+    async def test_successful_post_with_uring_backend(self, tiktok_server, mock_video_file):
+        """Should read chunks through aiofile when TIKTOK_IO_BACKEND is uring."""
+        pytest.importorskip("aiofile")
+        with patch.object(tiktok, "CHUNK_SIZE", 4096), patch.object(tiktok, "IO_BACKEND", "uring"):
+            result = await tiktok.post_video_async(mock_video_file, access_token="custom_token")
+
+        assert result["success"] is True
+        with open(mock_video_file, "rb") as f:
+            assert b"".join(
+                chunk for _, chunk in sorted(
+                    tiktok_server["chunks"].items(), key=lambda item: int(item[0].split()[1].split("-")[0]),
+                )
+            ) == f.read()
+
+    @pytest.mark.parametrize("backend", ["aiofiles", "uring"])
+    async def test_read_chunk(self, mock_video_file, backend):
+        """Should read the same byte range with either backend."""
+        pytest.importorskip("aiofiles" if backend == "aiofiles" else "aiofile")
+        with patch.object(tiktok, "IO_BACKEND", backend):
+            chunk = await tiktok._read_chunk_async(mock_video_file, 1000, 250)
+
+        with open(mock_video_file, "rb") as f:
+            assert chunk == f.read()[1000:1250]
+
+    async def test_transient_upload_failure_retried(self, tiktok_server, mock_video_file):
+        """Should retry a chunk the server answered with a 503."""
+        tiktok_server["fail_once"] = True
+
+        result = await tiktok.post_video_async(mock_video_file, access_token="custom_token")
+
+        assert result["success"] is True
+        assert tiktok_server["attempts"] == 2
+
+    async def test_upload_failure_raises_error(self, tiktok_server, mock_video_file):
+        """Should raise TikTokAPIError when a chunk upload fails."""
+        tiktok_server["fail_upload"] = True
+
+        with pytest.raises(tiktok.TikTokAPIError):
+            await tiktok.post_video_async(mock_video_file, access_token="custom_token")
+
+    async def test_failure_waits_for_cancelled_chunks(self, mock_video_file):
+        """Should let the other chunks finish cancelling before raising."""
+        unwound = []
+
+        async def upload_chunk(session, semaphore, upload_url, file_path, file_size, chunk):
+            if chunk.index == 0:
+                raise TikTokAPIError("upload_failed", "Chunk 0 upload failed")
+            try:
+                await asyncio.sleep(10)
+            finally:
+                unwound.append(chunk.index)
+
+        file_size = os.path.getsize(mock_video_file)
+        with patch.object(tiktok, "CHUNK_SIZE", 4096), \
+             patch("tiktok._upload_chunk_async", side_effect=upload_chunk):
+            chunk_count = len(tiktok._chunk_ranges(file_size))
+            with pytest.raises(TikTokAPIError):
+                await tiktok._upload_video_chunks_async(None, "http://upload", mock_video_file, file_size)
+
+        assert sorted(unwound) == list(range(1, chunk_count))
+
+    async def test_file_not_found_raises_error(self):
+        """Should raise FileNotFoundError for non-existent file."""
+        pytest.importorskip("aiohttp")
+        with pytest.raises(FileNotFoundError):
+            await tiktok.post_video_async("/nonexistent/path/video.mp4", access_token="custom_token")
+
+    async def test_requires_async_extra(self):
+        """Should explain how to install aiohttp when it is missing."""
+        with patch.object(tiktok, "aiohttp", None):
+            with pytest.raises(ImportError, match="--extra async"):
+                await tiktok.post_video_async("video.mp4", access_token="custom_token")
+
+
 class TestExceptions:
     """Tests for exception classes."""
 
@@ -215,3 +986,15 @@ class TestExceptions:
         """Should include helpful message about OAuth config."""
         error = MissingOAuthConfigError()
         assert "TIKTOK_CLIENT_KEY" in str(error)
+
+    def test_raise_if_error_passes_ok_response(self):
+        """Should accept a response whose error code is "ok"."""
+        tiktok._raise_if_error({"data": {}, "error": {"code": "ok"}})
+
+    @pytest.mark.parametrize("data", [{}, {"error": None}, {"error": {}}])
+    def test_raise_if_error_without_error_object(self, data):
+        """Should treat a response without an error code as a failure."""
+        with pytest.raises(TikTokAPIError) as exc_info:
+            tiktok._raise_if_error(data)
+        assert exc_info.value.code == "unknown"
+        assert exc_info.value.message == "Unknown error occurred"
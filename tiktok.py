@@ -1,19 +1,174 @@
 """TikTok Content Posting API integration."""
 
+import asyncio
+import http.client
+import json
+import mmap
 import os
 import secrets
+import threading
+import time
 import requests
-from typing import Optional
-from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, nullcontext
+from functools import cache, partial
+from requests.adapters import HTTPAdapter
+from typing import Callable, NamedTuple, Optional
+from urllib.parse import quote_plus, urlencode, urlsplit
+from urllib3.util.retry import Retry
+
+# orjson encodes and parses API bodies faster when installed (it comes with the
+# "fast" extra); the stdlib json module is used otherwise.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# post_video_async needs aiohttp and aiofiles (install the "async" extra);
+# the synchronous client works without them.
+try:
+    import aiofiles
+    import aiohttp
+except ImportError:
+    aiofiles = aiohttp = None
+
+# Optional io_uring-backed chunk reads for post_video_async on Linux (install
+# the "uring" extra and set TIKTOK_IO_BACKEND=uring); aiofiles is used otherwise.
+try:
+    from aiofile import AIOFile
+except ImportError:
+    AIOFile = None
 
 TIKTOK_API_BASE = "https://open.tiktokapis.com"
 TIKTOK_AUTH_BASE = "https://www.tiktok.com/v2/auth/authorize"
-CHUNK_SIZE = 10 * 1024 * 1024  # 10MB chunks for upload
+MB = 1024 * 1024
 
-# OAuth configuration from environment
-TIKTOK_CLIENT_KEY = os.getenv("TIKTOK_CLIENT_KEY")
-TIKTOK_CLIENT_SECRET = os.getenv("TIKTOK_CLIENT_SECRET")
-TIKTOK_REDIRECT_URI = os.getenv("TIKTOK_REDIRECT_URI", "http://localhost:8000/auth/tiktok/callback")
+# Chunk size is picked per upload so the thread pool stays busy without making
+# each retry unit huge: about four chunks per worker, rounded up to a power of
+# two and kept within TikTok's 5MB-64MB range. As TikTok expects, a video has
+# floor(size / chunk_size) chunks and the last one also carries the remaining
+# bytes (under 128MB), so videos shorter than two chunks go up in one.
+# TIKTOK_CHUNK_SIZE (bytes) fixes the size instead, clamped to the same range.
+MIN_CHUNK_SIZE = 5 * MB
+MAX_CHUNK_SIZE = 64 * MB
+CHUNKS_PER_WORKER = 4
+
+
+def _chunk_size_override() -> Optional[int]:
+    """TIKTOK_CHUNK_SIZE clamped to MIN_CHUNK_SIZE..MAX_CHUNK_SIZE, or None if unset."""
+    value = int(os.getenv("TIKTOK_CHUNK_SIZE", "0"))
+    if not value:
+        return None
+    return min(max(value, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+
+
+CHUNK_SIZE: Optional[int] = _chunk_size_override()
+
+# Chunks are streamed from disk in blocks of this size rather than read whole
+READ_BLOCK_SIZE = 64 * 1024
+
+# File read backend for post_video_async: "aiofiles" (default) or "uring"
+IO_BACKEND = os.getenv("TIKTOK_IO_BACKEND", "aiofiles")
+
+# Number of chunks uploaded at once; set to 1 to upload strictly in order
+MAX_UPLOAD_CONCURRENCY = int(os.getenv("TIKTOK_UPLOAD_CONCURRENCY", "8"))
+
+# Open a connection to the API host at app startup; set to 0 to disable
+WARM_CONNECTIONS = os.getenv("TIKTOK_WARM_CONNECTIONS", "1") != "0"
+
+# Publication statuses after which there is nothing left to poll for
+PUBLISH_FINAL_STATUSES = frozenset({"PUBLISH_COMPLETE", "FAILED"})
+
+# Headers shared by every chunk PUT; each chunk adds its own length and range
+_CHUNK_HEADERS = {"Content-Type": "video/mp4"}
+
+
+# OAuth configuration is read from the environment on first use and cached;
+# call _reset_config_cache() after changing it.
+@cache
+def _client_key() -> Optional[str]:
+    """TikTok app client key."""
+    return os.getenv("TIKTOK_CLIENT_KEY")
+
+
+@cache
+def _client_secret() -> Optional[str]:
+    """TikTok app client secret."""
+    return os.getenv("TIKTOK_CLIENT_SECRET")
+
+
+@cache
+def _redirect_uri() -> Optional[str]:
+    """OAuth callback URL registered with TikTok."""
+    return os.getenv("TIKTOK_REDIRECT_URI", "http://localhost:8000/auth/tiktok/callback")
+
+
+@cache
+def _auth_url_prefix() -> Optional[str]:
+    """Authorization URL up to the state parameter, the only per-call part; None if unconfigured."""
+    if not _client_key() or not _redirect_uri():
+        return None
+    return f"{TIKTOK_AUTH_BASE}/?" + urlencode({
+        "client_key": _client_key(),
+        "scope": "user.info.basic,video.upload,video.publish",
+        "response_type": "code",
+        "redirect_uri": _redirect_uri(),
+    })
+
+
+def _reset_config_cache() -> None:
+    """Forget cached OAuth configuration so the environment is read again."""
+    for accessor in (_client_key, _client_secret, _redirect_uri, _auth_url_prefix):
+        accessor.cache_clear()
+
+
+# Chunk PUTs that fail with a transient status are retried up to MAX_RETRIES
+# times, waiting RETRY_BACKOFF * 2**n seconds (capped at RETRY_BACKOFF_MAX).
+MAX_RETRIES = int(os.getenv("TIKTOK_MAX_RETRIES", "5"))
+RETRY_BACKOFF = 0.5
+RETRY_BACKOFF_MAX = 30
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Seconds a plain-HTTP (sendfile) chunk PUT may stall before it fails and is retried
+SENDFILE_TIMEOUT = 60
+
+# One session for every TikTok call, so chunk uploads and API requests reuse
+# pooled keep-alive connections instead of a new TLS handshake per request.
+# The adapter retries PUTs that fail to connect as a safety net under the
+# per-chunk retries; POSTs are never replayed, since that could start a second
+# upload or reuse a one-time authorization code.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        allowed_methods=["PUT"],
+        raise_on_status=False,
+    ),
+))
+
+
+def _warm_connection(url: str) -> None:
+    """Send a HEAD to url so the session pools a ready TLS connection to its host."""
+    try:
+        _SESSION.head(url, timeout=2)
+    except requests.RequestException:
+        pass
+
+
+def warm_connections() -> None:
+    """Start warming the API connection in the background.
+
+    Best-effort: the first token or init request then skips the DNS, TCP and
+    TLS setup, and nothing is lost if the HEAD fails.
+    """
+    threading.Thread(target=_warm_connection, args=(TIKTOK_API_BASE,), daemon=True).start()
+
+
+# Called as progress(uploaded_bytes, total_bytes, chunk_index) after each chunk
+ProgressCallback = Callable[[int, int, int], None]
 
 
 class TikTokAPIError(Exception):
@@ -53,6 +208,38 @@ def get_access_token() -> str:
     return token
 
 
+def _dumps(payload: dict) -> bytes:
+    """Encode a request body as JSON."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(body: bytes) -> dict:
+    """Decode a JSON response body."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _parse_json(response: requests.Response) -> dict:
+    """Decode the JSON body of a TikTok API response."""
+    return _loads(response.content)
+
+
+# Stand-in for a response without an "error" object, so _raise_if_error
+# doesn't build an empty dict for every response
+_NO_ERROR: dict = {}
+
+
+def _raise_if_error(data: dict) -> None:
+    """Raise TikTokAPIError unless an API response reports code "ok"."""
+    error = data.get("error") or _NO_ERROR
+    code = error.get("code")
+    if code != "ok":
+        raise TikTokAPIError(code or "unknown", error.get("message", "Unknown error occurred"))
+
+
 def _get_auth_headers(token: str) -> dict:
     """Get authorization headers for API requests."""
     return {
@@ -61,32 +248,53 @@ def _get_auth_headers(token: str) -> dict:
     }
 
 
-def get_authorization_url() -> tuple[str, str]:
+def get_authorization_url(state: Optional[str] = None) -> tuple[str, str]:
     """Generate TikTok OAuth authorization URL.
 
+    Args:
+        state: Optional CSRF state to embed. A random one is generated if omitted.
+
     Returns:
         Tuple of (authorization_url, state) where state is used for CSRF protection.
 
     Raises:
         MissingOAuthConfigError: If OAuth credentials are not configured.
     """
-    if not TIKTOK_CLIENT_KEY or not TIKTOK_REDIRECT_URI:
+    prefix = _auth_url_prefix()
+    if prefix is None:
         raise MissingOAuthConfigError()
 
-    state = secrets.token_urlsafe(32)
-
-    params = {
-        "client_key": TIKTOK_CLIENT_KEY,
-        "scope": "user.info.basic,video.upload,video.publish",
-        "response_type": "code",
-        "redirect_uri": TIKTOK_REDIRECT_URI,
-        "state": state,
-    }
+    if state is None:
+        state = secrets.token_urlsafe(32)
 
-    auth_url = f"{TIKTOK_AUTH_BASE}/?{urlencode(params)}"
+    auth_url = f"{prefix}&state={quote_plus(state)}"
     return auth_url, state
 
 
+def _request_token(payload: dict) -> dict:
+    """POST to the OAuth token endpoint and return the normalized token data."""
+    url = f"{TIKTOK_API_BASE}/v2/oauth/token/"
+
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+    response = _SESSION.post(url, data=payload, headers=headers)
+    data = _parse_json(response)
+
+    if "error" in data or response.status_code != 200:
+        error_msg = data.get("error_description", data.get("message", "Token exchange failed"))
+        raise TikTokAPIError(
+            data.get("error", "token_exchange_failed"),
+            error_msg,
+        )
+
+    return {
+        "access_token": data["access_token"],
+        "refresh_token": data.get("refresh_token"),
+        "expires_in": data.get("expires_in"),
+        "token_type": data.get("token_type"),
+    }
+
+
 def exchange_code_for_token(code: str) -> dict:
     """Exchange authorization code for access token.
 
@@ -100,44 +308,46 @@ def exchange_code_for_token(code: str) -> dict:
         MissingOAuthConfigError: If OAuth credentials are not configured.
         TikTokAPIError: If token exchange fails.
     """
-    if not TIKTOK_CLIENT_KEY or not TIKTOK_CLIENT_SECRET:
+    if not _client_key() or not _client_secret():
         raise MissingOAuthConfigError()
 
-    url = f"{TIKTOK_API_BASE}/v2/oauth/token/"
-
-    payload = {
-        "client_key": TIKTOK_CLIENT_KEY,
-        "client_secret": TIKTOK_CLIENT_SECRET,
+    return _request_token({
+        "client_key": _client_key(),
+        "client_secret": _client_secret(),
         "code": code,
         "grant_type": "authorization_code",
-        "redirect_uri": TIKTOK_REDIRECT_URI,
-    }
+        "redirect_uri": _redirect_uri(),
+    })
 
-    headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-    response = requests.post(url, data=payload, headers=headers)
-    data = response.json()
+def refresh_access_token(refresh_token: str) -> dict:
+    """Get a new access token using a refresh token.
 
-    if "error" in data or response.status_code != 200:
-        error_msg = data.get("error_description", data.get("message", "Token exchange failed"))
-        raise TikTokAPIError(
-            data.get("error", "token_exchange_failed"),
-            error_msg,
-        )
+    Args:
+        refresh_token: The refresh token saved when the account was linked.
 
-    return {
-        "access_token": data["access_token"],
-        "refresh_token": data.get("refresh_token"),
-        "expires_in": data.get("expires_in"),
-        "token_type": data.get("token_type"),
-    }
+    Returns:
+        Dict containing access_token, refresh_token, expires_in, etc.
 
+    Raises:
+        MissingOAuthConfigError: If OAuth credentials are not configured.
+        TikTokAPIError: If the refresh fails.
+    """
+    if not _client_key() or not _client_secret():
+        raise MissingOAuthConfigError()
+
+    return _request_token({
+        "client_key": _client_key(),
+        "client_secret": _client_secret(),
+        "grant_type": "refresh_token",
+        "refresh_token": refresh_token,
+    })
 
-def _init_video_upload(token: str, file_size: int) -> dict:
-    """Initialize a video upload with TikTok."""
-    url = f"{TIKTOK_API_BASE}/v2/post/publish/video/init/"
 
-    payload = {
+def _init_payload(file_size: int) -> dict:
+    """Build the request body that starts a chunked video upload."""
+    chunk_size = _choose_chunk_size(file_size)
+    return {
         "post_info": {
             "title": "Video uploaded via Autoposter",
             "privacy_level": "SELF_ONLY",
@@ -148,50 +358,288 @@ def _init_video_upload(token: str, file_size: int) -> dict:
         "source_info": {
             "source": "FILE_UPLOAD",
             "video_size": file_size,
-            "chunk_size": CHUNK_SIZE,
-            "total_chunk_count": (file_size + CHUNK_SIZE - 1) // CHUNK_SIZE,
+            "chunk_size": chunk_size,
+            "total_chunk_count": _chunk_count(file_size, chunk_size),
         },
     }
 
-    response = requests.post(url, json=payload, headers=_get_auth_headers(token))
-    data = response.json()
 
-    if data.get("error", {}).get("code") != "ok":
-        error = data.get("error", {})
-        raise TikTokAPIError(
-            error.get("code", "unknown"),
-            error.get("message", "Unknown error occurred"),
-        )
+def _init_video_upload(token: str, file_size: int) -> dict:
+    """Initialize a video upload with TikTok."""
+    url = f"{TIKTOK_API_BASE}/v2/post/publish/video/init/"
+    payload = _init_payload(file_size)
+
+    response = _SESSION.post(url, data=_dumps(payload), headers=_get_auth_headers(token))
+    data = _parse_json(response)
+
+    _raise_if_error(data)
 
     return data["data"]
 
 
-def _upload_video_chunks(upload_url: str, file_path: str, file_size: int) -> None:
-    """Upload video file in chunks to TikTok."""
-    with open(file_path, "rb") as f:
-        chunk_index = 0
-        offset = 0
+class _ChunkReader:
+    """Read-only file view of one byte range of a mapped video, so a chunk PUT
+    streams straight from the page cache.
+
+    len() gives requests the Content-Length up front (it would otherwise fall
+    back to chunked transfer encoding), and tell()/seek() let urllib3 rewind
+    the body when it retries the PUT.
+    """
+
+    def __init__(self, buf, offset: int, length: int):
+        self._buf = buf
+        self._offset = offset
+        self._length = length
+        self._pos = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._length - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        start = self._offset + self._pos
+        data = self._buf[start:start + min(size, READ_BLOCK_SIZE)]
+        self._pos += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            pos += self._pos
+        elif whence == os.SEEK_END:
+            pos += self._length
+        self._pos = max(0, min(pos, self._length))
+        return self._pos
+
 
-        while offset < file_size:
-            chunk = f.read(CHUNK_SIZE)
-            chunk_end = min(offset + len(chunk), file_size)
+class _Chunk(NamedTuple):
+    """One byte range of a video, with the PUT headers that describe it."""
 
-            headers = {
-                "Content-Type": "video/mp4",
-                "Content-Length": str(len(chunk)),
-                "Content-Range": f"bytes {offset}-{chunk_end - 1}/{file_size}",
-            }
+    index: int
+    offset: int
+    length: int
+    headers: dict
 
-            response = requests.put(upload_url, data=chunk, headers=headers)
 
-            if response.status_code not in (200, 201, 206):
-                raise TikTokAPIError(
-                    "upload_failed",
-                    f"Chunk {chunk_index} upload failed with status {response.status_code}",
-                )
+def _make_chunk(index: int, offset: int, length: int, file_size: int) -> _Chunk:
+    """Describe one byte range of a file_size-byte video."""
+    headers = _CHUNK_HEADERS.copy()
+    headers["Content-Length"] = str(length)
+    headers["Content-Range"] = f"bytes {offset}-{offset + length - 1}/{file_size}"
+    return _Chunk(index, offset, length, headers)
 
-            offset = chunk_end
-            chunk_index += 1
+
+def _choose_chunk_size(file_size: int) -> int:
+    """Pick the chunk size for a file_size-byte video.
+
+    Depends only on the file size and settings, so the init request and the
+    upload always agree on it.
+    """
+    if CHUNK_SIZE:
+        return max(1, min(CHUNK_SIZE, file_size))
+    if file_size <= MIN_CHUNK_SIZE:
+        return max(file_size, 1)
+
+    target = file_size // (max(1, MAX_UPLOAD_CONCURRENCY) * CHUNKS_PER_WORKER)
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, 1 << (target - 1).bit_length()))
+
+
+def _chunk_count(file_size: int, chunk_size: int) -> int:
+    """Number of chunks TikTok expects: whole chunks, with the remainder folded into the last."""
+    return max(1, file_size // chunk_size) if file_size else 0
+
+
+def _chunk_ranges(file_size: int) -> list[_Chunk]:
+    """Split a file into chunks of the chosen size, building each chunk's headers once.
+
+    The last chunk runs to the end of the file.
+    """
+    chunk_size = _choose_chunk_size(file_size)
+    count = _chunk_count(file_size, chunk_size)
+    return [
+        _make_chunk(
+            index,
+            index * chunk_size,
+            file_size - index * chunk_size if index == count - 1 else chunk_size,
+            file_size,
+        )
+        for index in range(count)
+    ]
+
+
+def _retry_delay(attempt: int) -> float:
+    """Seconds to wait before retry number attempt (counting from 1)."""
+    return min(RETRY_BACKOFF * 2 ** (attempt - 1), RETRY_BACKOFF_MAX)
+
+
+def _remaining_chunk(chunk: _Chunk, file_size: int, received: Optional[str]) -> Optional[_Chunk]:
+    """After a 308, the part of chunk the server still needs, or None if it has it all.
+
+    received is the response's Range header (e.g. "bytes=0-1048575"), giving the
+    last byte stored so far; without it the whole chunk is sent again.
+    """
+    offset = chunk.offset
+    if received:
+        try:
+            offset = max(offset, int(received.rpartition("-")[2]) + 1)
+        except ValueError:
+            pass
+
+    end = chunk.offset + chunk.length
+    if offset >= end:
+        return None
+    return _make_chunk(chunk.index, offset, end - offset, file_size)
+
+
+def _put_chunk(upload_url: str, mapped, part: _Chunk) -> tuple[int, Optional[str]]:
+    """PUT one chunk of a mapped video through the shared session; returns (status, Range header)."""
+    body = _ChunkReader(mapped, part.offset, part.length)
+    response = _SESSION.put(upload_url, data=body, headers=part.headers)
+    return response.status_code, response.headers.get("Range")
+
+
+class _HTTPConnections:
+    """Keep-alive connections to a plain-HTTP upload URL, one per worker thread.
+
+    Used as a context manager around an upload; every connection opened during
+    it is closed on exit.
+    """
+
+    def __init__(self, upload_url: str):
+        url = urlsplit(upload_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.path = f"{url.path or '/'}?{url.query}" if url.query else url.path or "/"
+        self._local = threading.local()
+        self._opened: list[http.client.HTTPConnection] = []
+
+    def get(self) -> http.client.HTTPConnection:
+        """Return the calling thread's connection, creating it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=SENDFILE_TIMEOUT)
+            self._opened.append(conn)
+        return conn
+
+    def __enter__(self) -> "_HTTPConnections":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for conn in self._opened:
+            conn.close()
+
+
+def _sendfile_chunk(connections: _HTTPConnections, f, part: _Chunk) -> tuple[int, Optional[str]]:
+    """PUT one chunk over plain HTTP with socket.sendfile; returns (status, Range header).
+
+    The kernel copies the chunk from the file to the socket, so its bytes never
+    pass through Python. Only possible without TLS.
+    """
+    conn = connections.get()
+    try:
+        conn.putrequest("PUT", connections.path)
+        for name, value in part.headers.items():
+            conn.putheader(name, value)
+        conn.endheaders()
+        conn.sock.sendfile(f, offset=part.offset, count=part.length)
+
+        response = conn.getresponse()
+        response.read()
+    except BaseException:
+        # Drop the half-used connection; the next request reconnects
+        conn.close()
+        raise
+
+    if response.will_close:
+        conn.close()
+    return response.status, response.getheader("Range")
+
+
+def _upload_chunk(
+    upload_url: str, file_path: str, file_size: int, chunk: _Chunk,
+    connections: Optional[_HTTPConnections] = None,
+) -> None:
+    """Upload one chunk, retrying transient failures and resuming after a 308.
+
+    Reads through its own file handle, so workers don't share a position. With
+    connections (plain-HTTP upload URLs) the chunk is sent with sendfile;
+    otherwise it goes through the session from a read-only mapping of the file.
+    """
+    part = chunk
+    with open(file_path, "rb") as f, ExitStack() as stack:
+        if connections is not None:
+            send = partial(_sendfile_chunk, connections, f)
+        else:
+            mapped = stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            send = partial(_put_chunk, upload_url, mapped)
+
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(_retry_delay(attempt))
+
+            try:
+                status_code, received = send(part)
+            except (requests.ConnectionError, requests.Timeout, http.client.HTTPException, OSError):
+                if attempt == MAX_RETRIES:
+                    raise
+                continue
+
+            if status_code in (200, 201, 206):
+                return
+            if status_code == 308:
+                part = _remaining_chunk(chunk, file_size, received)
+                if part is None:
+                    return
+            elif status_code not in RETRYABLE_STATUSES:
+                break
+
+    raise TikTokAPIError(
+        "upload_failed",
+        f"Chunk {chunk.index} upload failed with status {status_code}",
+    )
+
+
+def _upload_video_chunks(
+    upload_url: str, file_path: str, file_size: int, progress: Optional[ProgressCallback] = None,
+) -> None:
+    """Upload video file in chunks to TikTok, up to MAX_UPLOAD_CONCURRENCY at a time.
+
+    progress, if given, is called from this thread as each chunk finishes,
+    with the total bytes uploaded so far.
+    """
+    chunks = _chunk_ranges(file_size)
+    uploaded = 0
+
+    sendfile_connections = _HTTPConnections(upload_url) if upload_url.startswith("http://") else nullcontext()
+    with sendfile_connections as connections:
+        upload = partial(_upload_chunk, upload_url, file_path, file_size, connections=connections)
+
+        if len(chunks) <= 1 or MAX_UPLOAD_CONCURRENCY <= 1:
+            for chunk in chunks:
+                upload(chunk)
+                if progress is not None:
+                    uploaded += chunk.length
+                    progress(uploaded, file_size, chunk.index)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(MAX_UPLOAD_CONCURRENCY, len(chunks))) as executor:
+            futures = {executor.submit(upload, chunk): chunk for chunk in chunks}
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    if progress is not None:
+                        chunk = futures[future]
+                        uploaded += chunk.length
+                        progress(uploaded, file_size, chunk.index)
+            except BaseException:
+                # Don't start chunks that are still queued once one has failed
+                for future in futures:
+                    future.cancel()
+                raise
 
 
 def _check_publish_status(token: str, publish_id: str) -> dict:
@@ -200,32 +648,77 @@ def _check_publish_status(token: str, publish_id: str) -> dict:
 
     payload = {"publish_id": publish_id}
 
-    response = requests.post(url, json=payload, headers=_get_auth_headers(token))
-    data = response.json()
+    response = _SESSION.post(url, data=_dumps(payload), headers=_get_auth_headers(token))
+    data = _parse_json(response)
 
-    if data.get("error", {}).get("code") != "ok":
-        error = data.get("error", {})
-        raise TikTokAPIError(
-            error.get("code", "unknown"),
-            error.get("message", "Unknown error occurred"),
-        )
+    _raise_if_error(data)
 
     return data["data"]
 
 
-def post_video(file_path: str, access_token: Optional[str] = None) -> dict:
+def _next_poll_delay(delay: float, deadline: float, factor: float, cap: float) -> float:
+    """Grow a polling delay by factor up to cap, without sleeping past the deadline."""
+    return max(0.0, min(delay * factor, cap, deadline - time.monotonic()))
+
+
+def wait_for_publish(token: str, publish_id: str, timeout: float = 300.0, initial: float = 1.0,
+                     factor: float = 2.0, cap: float = 10.0) -> dict:
+    """Poll a publication's status until TikTok finishes processing it.
+
+    Waits initial seconds between the first polls, growing by factor up to cap.
+
+    Returns:
+        The last status data: PUBLISH_COMPLETE or FAILED, or whatever status
+        was reported when timeout seconds ran out.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while True:
+        status_data = _check_publish_status(token, publish_id)
+        if status_data.get("status") in PUBLISH_FINAL_STATUSES or time.monotonic() + delay > deadline:
+            return status_data
+        time.sleep(delay)
+        delay = _next_poll_delay(delay, deadline, factor, cap)
+
+
+def _publish_result(publish_id: str, status_data: dict) -> dict:
+    """Build post_video's result from a publication status, raising if publishing failed.
+
+    success is only True once TikTok reports PUBLISH_COMPLETE; a video still
+    being processed comes back with success False and its current status.
+    """
+    status = status_data.get("status", "UNKNOWN")
+    if status == "FAILED":
+        raise TikTokAPIError("publish_failed", status_data.get("fail_reason") or "Publishing failed")
+
+    return {
+        "success": status == "PUBLISH_COMPLETE",
+        "publish_id": publish_id,
+        "status": status,
+    }
+
+
+def post_video(
+    file_path: str, access_token: Optional[str] = None, progress: Optional[ProgressCallback] = None,
+    wait: bool = True,
+) -> dict:
     """Post a video to TikTok.
 
     Args:
         file_path: Path to the video file to upload.
         access_token: Optional access token. If not provided, reads from environment.
+        progress: Optional callback, called as progress(uploaded_bytes, total_bytes,
+            chunk_index) after each chunk is uploaded.
+        wait: Poll until TikTok finishes processing the video (see
+            wait_for_publish). If False, check its status once after the upload.
 
     Returns:
-        Dict containing the publication result with status and publish_id.
+        Dict containing the publication result with status and publish_id;
+        success is True once the video is published.
 
     Raises:
         MissingTokenError: If access token is not configured.
-        TikTokAPIError: If any API call fails.
+        TikTokAPIError: If any API call fails or TikTok fails to publish the video.
         FileNotFoundError: If the video file doesn't exist.
     """
     if access_token is None:
@@ -242,12 +735,175 @@ def post_video(file_path: str, access_token: Optional[str] = None) -> dict:
     publish_id = init_data["publish_id"]
     upload_url = init_data["upload_url"]
 
-    _upload_video_chunks(upload_url, file_path, file_size)
+    _upload_video_chunks(upload_url, file_path, file_size, progress)
 
-    status_data = _check_publish_status(token, publish_id)
+    if wait:
+        status_data = wait_for_publish(token, publish_id)
+    else:
+        status_data = _check_publish_status(token, publish_id)
+    return _publish_result(publish_id, status_data)
 
-    return {
-        "success": True,
-        "publish_id": publish_id,
-        "status": status_data.get("status", "UNKNOWN"),
-    }
+
+def post_videos_batch(paths: list[str], access_token: Optional[str] = None, max_concurrency: int = 4) -> list[dict]:
+    """Post several videos to TikTok, up to max_concurrency at a time.
+
+    One video's init and status calls overlap with another's chunk uploads,
+    and every upload shares the pooled session.
+
+    Args:
+        paths: Paths to the video files to upload.
+        access_token: Optional access token. If not provided, reads from environment.
+        max_concurrency: Number of videos posted at once.
+
+    Returns:
+        One result per path, in the same order: the post_video result, or
+        {"success": False, "error": ..., "path": ...} if that video failed.
+
+    Raises:
+        MissingTokenError: If access token is not configured.
+    """
+    token = get_access_token() if access_token is None else access_token
+
+    def post(path: str) -> dict:
+        try:
+            return post_video(path, token)
+        except Exception as e:
+            # Anything one video raises (API errors, a non-JSON body, a
+            # malformed response) is reported in its slot, not raised
+            return {"success": False, "error": str(e), "path": path}
+
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(paths)))) as executor:
+        return list(executor.map(post, paths))
+
+
+async def _api_post_async(session, url: str, token: str, payload: dict) -> dict:
+    """POST to the TikTok API and return its data, raising on an error response."""
+    async with session.post(url, data=_dumps(payload), headers=_get_auth_headers(token)) as response:
+        data = _loads(await response.read())
+
+    _raise_if_error(data)
+
+    return data["data"]
+
+
+async def _read_chunk_async(file_path: str, offset: int, length: int) -> bytes:
+    """Read one chunk for the async uploader, through io_uring when configured.
+
+    Reads are issued as soon as an upload slot is free, so with the uring
+    backend up to MAX_UPLOAD_CONCURRENCY of them are queued on the ring at once.
+    """
+    if IO_BACKEND == "uring" and AIOFile is not None:
+        async with AIOFile(file_path, "rb") as f:
+            return await f.read(length, offset)
+
+    async with aiofiles.open(file_path, "rb") as f:
+        await f.seek(offset)
+        return await f.read(length)
+
+
+async def _upload_chunk_async(session, semaphore: asyncio.Semaphore, upload_url: str, file_path: str,
+                              file_size: int, chunk: _Chunk) -> None:
+    """Upload one chunk once a slot in the semaphore is free, retrying like _upload_chunk."""
+    async with semaphore:
+        data = await _read_chunk_async(file_path, chunk.offset, chunk.length)
+
+        part = chunk
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(_retry_delay(attempt))
+
+            body = memoryview(data)[part.offset - chunk.offset:]
+            try:
+                async with session.put(upload_url, data=body, headers=part.headers) as response:
+                    status_code = response.status
+                    received = response.headers.get("Range")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+                continue
+
+            if status_code in (200, 201, 206):
+                return
+            if status_code == 308:
+                part = _remaining_chunk(chunk, file_size, received)
+                if part is None:
+                    return
+            elif status_code not in RETRYABLE_STATUSES:
+                break
+
+    raise TikTokAPIError(
+        "upload_failed",
+        f"Chunk {chunk.index} upload failed with status {status_code}",
+    )
+
+
+async def _upload_video_chunks_async(session, upload_url: str, file_path: str, file_size: int) -> None:
+    """Upload video file in chunks, up to MAX_UPLOAD_CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(max(1, MAX_UPLOAD_CONCURRENCY))
+    tasks = [
+        asyncio.create_task(_upload_chunk_async(session, semaphore, upload_url, file_path, file_size, chunk))
+        for chunk in _chunk_ranges(file_size)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop the remaining chunks once one has failed, and let them unwind
+        # before the caller closes the session they are using
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _wait_for_publish_async(session, token: str, publish_id: str, timeout: float = 300.0,
+                                  initial: float = 1.0, factor: float = 2.0, cap: float = 10.0) -> dict:
+    """Poll a publication's status like wait_for_publish, sleeping without blocking the loop."""
+    url = f"{TIKTOK_API_BASE}/v2/post/publish/status/fetch/"
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while True:
+        status_data = await _api_post_async(session, url, token, {"publish_id": publish_id})
+        if status_data.get("status") in PUBLISH_FINAL_STATUSES or time.monotonic() + delay > deadline:
+            return status_data
+        await asyncio.sleep(delay)
+        delay = _next_poll_delay(delay, deadline, factor, cap)
+
+
+async def post_video_async(file_path: str, access_token: Optional[str] = None) -> dict:
+    """Post a video to TikTok without blocking the event loop.
+
+    Same contract as post_video, using aiohttp for requests and aiofiles for
+    reading chunks; requires the "async" extra.
+
+    Raises:
+        ImportError: If aiohttp or aiofiles is not installed.
+        MissingTokenError: If access token is not configured.
+        TikTokAPIError: If any API call fails or TikTok fails to publish the video.
+        FileNotFoundError: If the video file doesn't exist.
+    """
+    if aiohttp is None:
+        raise ImportError("post_video_async requires aiohttp and aiofiles: uv sync --extra async")
+
+    if access_token is None:
+        token = get_access_token()
+    else:
+        token = access_token
+
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Video file not found: {file_path}")
+
+    file_size = os.path.getsize(file_path)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=16)) as session:
+        init_data = await _api_post_async(
+            session, f"{TIKTOK_API_BASE}/v2/post/publish/video/init/", token, _init_payload(file_size),
+        )
+        publish_id = init_data["publish_id"]
+
+        await _upload_video_chunks_async(session, init_data["upload_url"], file_path, file_size)
+
+        status_data = await _wait_for_publish_async(session, token, publish_id)
+
+    return _publish_result(publish_id, status_data)